@@ -5,32 +5,850 @@ import git
 import tempfile
 import re
 import stat
+import mmap
+import fnmatch
+import functools
+import hashlib
+import subprocess
+import time
+import threading
+import copy
+import itertools
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import re2  # optional: google-re2, linear-time DFA matching
+except ImportError:
+    re2 = None
+
+try:
+    import ijson  # optional: streaming JSON parser for big manifests
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optional: faster whole-document JSON decoding
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import pathspec  # optional: full gitignore semantics for .autodocsignore
+except ImportError:
+    pathspec = None
 
 # --- CONFIGURATION ---
 STD_LIBS = {
-    'python': {
+    'python': frozenset({
         'os', 'sys', 're', 'json', 'math', 'datetime', 'time', 'random',
         'subprocess', 'typing', 'collections', 'threading', 'asyncio',
         'logging', 'argparse', 'itertools', 'functools', 'pathlib', 'http',
         'email', 'enum', 'statistics', 'fractions'
-    },
-    'node': {
+    }),
+    'node': frozenset({
         'fs', 'path', 'http', 'https', 'os', 'util', 'events', 'crypto',
         'child_process', 'cluster', 'dns', 'net', 'stream', 'querystring',
         'url', 'zlib', 'timers'
-    },
-    'java': {'java.lang', 'java.util', 'java.io', 'java.net', 'java.math'},
-    'go': {'fmt', 'os', 'net', 'time', 'encoding', 'sync', 'strings',
-           'strconv', 'io', 'log', 'bufio', 'errors', 'context'}
+    }),
+    'java': frozenset({'java.lang', 'java.util', 'java.io', 'java.net', 'java.math'}),
+    'go': frozenset({'fmt', 'os', 'net', 'time', 'encoding', 'sync', 'strings',
+                     'strconv', 'io', 'log', 'bufio', 'errors', 'context'})
 }
 
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     '.git', 'node_modules', 'venv', '.env', '__pycache__',
     'dist', 'build', 'target', 'vendor', '.idea', '.vscode',
     'coverage', '.next', '__mocks__', 'assets', 'bin', 'obj', 'out', '.settings'
+})
+
+# File names that mark CI and formatter configs
+CI_CONFIG_FILES = frozenset({
+    'circle.yml', '.gitlab-ci.yml', 'azure-pipelines.yml',
+    'bitbucket-pipelines.yml', '.travis.yml'
+})
+PRETTIER_CONFIG_FILES = frozenset({'.prettierrc', '.prettierrc.js', '.prettierrc.json'})
+
+# Manifest dependencies reported as test frameworks
+NODE_TEST_DEPS = frozenset({'jest', 'mocha', 'chai', 'supertest'})
+PYTHON_TEST_DEPS = frozenset({'pytest', 'unittest', 'nose', 'mock'})
+# Java imports left out of the dependency list (str.startswith prefixes)
+JAVA_STD_PREFIXES = ('java.lang', 'java.util', 'java.io')
+
+# Dependencies drawn as datastores in the component diagram
+_DB_DEPS = frozenset({'mongoose', 'mongodb', 'pg', 'mysql', 'mysql2', 'sequelize'})
+_CACHE_DEPS = frozenset({'redis', 'ioredis'})
+# Dependencies that put a database in the sequence diagram
+_DB_CLIENT_DEPS = frozenset({
+    'mongoose', 'mongodb', 'sqlalchemy', 'pymongo', 'mysql',
+    'mysql2', 'pg', 'psycopg2', 'psycopg2-binary'
+})
+
+# dependency (lower-cased) -> (tech_stack_details category, label) pairs, per
+# language; drives DeepScanner._infer_tech_stack
+_TECH_SIGNATURES = {
+    'Python': {
+        'django': (('frameworks', 'Django'),),
+        'flask': (('frameworks', 'Flask'),),
+        'fastapi': (('frameworks', 'FastAPI'),),
+        'psycopg2': (('databases', 'PostgreSQL'),),
+        'psycopg2-binary': (('databases', 'PostgreSQL'),),
+        'mysqlclient': (('databases', 'MySQL'),),
+        'pymysql': (('databases', 'MySQL'),),
+        'pymongo': (('databases', 'MongoDB'),),
+        'motor': (('databases', 'MongoDB'),),
+        'sqlalchemy': (('databases', 'SQL (SQLAlchemy)'),),
+        'jwt': (('auth', 'JWT'),),
+        'django-allauth': (('auth', 'Django Allauth'),),
+        'djangorestframework-simplejwt': (('auth', 'DRF + JWT'),),
+        'redis': (('cache', 'Redis'),),
+    },
+    'Node.js': {
+        'express': (('frameworks', 'Express'),),
+        'next': (('frameworks', 'Next.js'),),
+        'next.js': (('frameworks', 'Next.js'),),
+        'nuxt': (('frameworks', 'Nuxt.js'),),
+        'nuxt.js': (('frameworks', 'Nuxt.js'),),
+        'nest': (('frameworks', 'NestJS'),),
+        'nestjs': (('frameworks', 'NestJS'),),
+        'koa': (('frameworks', 'Koa'),),
+        'mongoose': (('databases', 'MongoDB'),),
+        'pg': (('databases', 'PostgreSQL'),),
+        'pg-promise': (('databases', 'PostgreSQL'),),
+        'mysql2': (('databases', 'MySQL'),),
+        'redis': (('databases', 'Redis'), ('cache', 'Redis')),
+        'ioredis': (('databases', 'Redis'), ('cache', 'Redis')),
+        'jsonwebtoken': (('auth', 'JWT'),),
+        'passport': (('auth', 'Passport.js'),),
+    },
+    'Go': {
+        'gin': (('frameworks', 'Gin'),),
+        'echo': (('frameworks', 'Echo'),),
+    },
+}
+
+# A directory holding any of these files is skipped with everything below it
+PRUNE_MARKER_FILES = frozenset({'CACHEDIR.TAG', '.nobuild', '.noreadmescan'})
+
+# Per-repo, gitignore-style list of paths to leave out of the scan
+IGNORE_FILE = '.autodocsignore'
+
+# Generated / minified sources: counted in stats but never opened
+EXCLUDE_FILE_GLOBS = (
+    '*.min.*', '*.bundle.js', 'bundle.*.js', '*.chunk.js',
+    '*.pb.go', '*_pb2.py'
+)
+
+# Scan results kept in memory, keyed by (repo url/path, commit sha or mtime)
+SCAN_CACHE_SIZE = 64
+# ...and on disk, so restarts and other workers reuse them ('' disables)
+SCAN_CACHE_DIR = os.environ.get('AUTODOCS_CACHE_DIR', os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'autodocs'))
+SCAN_CACHE_TTL = 24 * 3600   # seconds
+# Bump whenever the metadata layout changes, so older entries are not read
+SCAN_CACHE_VERSION = 1
+
+# Below this many source files, worker start-up costs more than it saves
+PARALLEL_MIN_FILES = 200
+# Analysis worker processes, shared by all scans in this process
+ANALYZE_WORKERS = os.cpu_count() or 1
+# Threads reading files ahead of the in-process scan (reads release the GIL),
+# shared by all scans in this process
+READ_THREADS = min(32, (os.cpu_count() or 1) * 4)
+
+# Source files larger than this are counted but not analyzed (vendored libs etc.)
+MAX_ANALYZE_BYTES = 512 * 1024
+# Below this size a plain read() is cheaper than setting up an mmap
+MMAP_MIN_BYTES = 4 * 1024
+# package.json files above this are streamed with ijson (when installed)
+PACKAGE_JSON_STREAM_BYTES = 256 * 1024
+# Once a top-level directory has queued this much source, the rest of it is
+# only counted (keeps a vendored third_party/ from dominating the scan)
+MAX_SUBTREE_BYTES = 50 * 1024 * 1024
+
+# --- PATTERNS (compiled once at import) ---
+# One bytes alternation per language so each file is scanned in a single
+# pass straight off the mmap. Each branch is an outer named group (its kind,
+# found via m.lastindex); inner groups are read by offset from that index,
+# since re2 reports group names of bytes patterns as bytes.
+# Flags are written inline so the same source compiles under re and re2.
+# (re.Scanner is not used: it anchors at every offset, so the non-matching
+# bulk of a file would need a catch-all token per character, where
+# finditer skips ahead to the next possible match.)
+
+def _compile(pattern):
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass  # construct unsupported by RE2, use the stdlib engine
+    return re.compile(pattern)
+
+
+def _kinds(regex):
+    """Map group index -> branch name for the named groups of regex."""
+    return {idx: (name.decode() if isinstance(name, bytes) else name)
+            for name, idx in regex.groupindex.items()}
+
+
+# process.env.VAR, os.environ["VAR"], os.environ.get("VAR"), os.getenv("VAR")
+_ENV_PATTERN = (
+    rb'(?P<env>process\.env\.([A-Z_][A-Z0-9_]*)'
+    rb'|os\.environ\[\s*[\'"]([A-Z_][A-Z0-9_]*)[\'"]\s*\]'
+    rb'|os\.environ\.get\(\s*[\'"]([A-Z_][A-Z0-9_]*)[\'"]'
+    rb'|os\.getenv\(\s*[\'"]([A-Z_][A-Z0-9_]*)[\'"])'
+)
+_HTTP_METHODS = rb'get|post|put|delete|patch|options|head'
+
+_RE_PY_SCAN = _compile(rb'(?m)' + b'|'.join((
+    # [ \t], not \s: after a line ending in 'class' (import dataclass,
+    # '# base class') the match must not swallow the next line's import
+    rb'(?P<cls>class[ \t]+(\w+))',
+    # top-level package only; relative imports never match
+    rb'(?P<imp>^(?:from|import)[ \t]+(\w+))',
+    _ENV_PATTERN,
+    # FastAPI style: @app.get("/path")
+    rb'(?P<route>(?i:@app\.(' + _HTTP_METHODS + rb')\(\s*[\'"]([^\'"]+)[\'"]))',
+    # Flask: @app.route("/path", methods=["GET","POST"])
+    rb'(?P<flask>@app\.route\(\s*[\'"]([^\'"]+)[\'"]\s*,\s*methods\s*=\s*\[([^\]]+)\])',
+    # Django urls.py: path("users/", ...)
+    rb'(?P<django>path\(\s*[\'"]([^\'"]+)[\'"])',
+    # entry point markers (the scan is the only pass over the file); only the
+    # double-quoted __main__ guard counts, as it always has
+    rb'(?P<entry>if __name__ == "__main__":|app\.run\()',
+)))
+
+_RE_JS_SCAN = _compile(b'|'.join((
+    # import x from 'y', import 'y', import('y'), require('y')
+    rb'(?P<imp>(?:\brequire\s*\(\s*|\bimport\s*\(?\s*|from\s*)[\'"]([@\w./-]+)[\'"])',
+    _ENV_PATTERN,
+    # Express: app.get('/path', ...), router.post('/path', ...)
+    rb'(?P<route>(?i:\b(?:app|router)\.(' + _HTTP_METHODS + rb')\(\s*[\'"]([^\'"]+)[\'"]))',
+    rb'(?P<entry>app\.listen|server\.listen)',
+)))
+
+_RE_GO_SCAN = _compile(b'|'.join((
+    rb'(?P<imp>"([\w/\.]+)")',
+    _ENV_PATTERN,
+    rb'(?P<entry>func main\(\))',
+)))
+
+_RE_JAVA_SCAN = _compile(b'|'.join((
+    rb'(?P<cls>class[ \t]+(\w+))',
+    rb'(?P<imp>import\s+([\w\.]+);)',
+    _ENV_PATTERN,
+    rb'(?P<entry>public static void main)',
+)))
+
+_PY_KINDS = _kinds(_RE_PY_SCAN)
+_JS_KINDS = _kinds(_RE_JS_SCAN)
+_GO_KINDS = _kinds(_RE_GO_SCAN)
+_JAVA_KINDS = _kinds(_RE_JAVA_SCAN)
+
+_RE_HTTP_METHOD = _compile(rb'[\'"]([A-Z]+)[\'"]')
+
+# License family from the head of LICENSE/COPYING; first whole-word hit wins
+_LICENSE_RE = _compile(rb'(?i)\b(MIT|APACHE|GNU|GPL|BSD|MPL)\b')
+_LICENSE_NAMES = {
+    b'MIT': 'MIT',
+    b'APACHE': 'Apache 2.0',
+    b'GNU': 'GPL',
+    b'GPL': 'GPL',
+    b'BSD': 'BSD',
+    b'MPL': 'MPL 2.0',
+}
+LICENSE_HEAD_BYTES = 128
+_RE_LICENSE_FILE = re.compile(r'(?i)LICENSE|COPYING')
+
+# Maven coordinates vary too much for exact keys; matched case-insensitively
+_RE_SPRING = re.compile(r'(?i)spring')
+
+# owner/repo at the end of an HTTPS, ssh:// or scp-style (git@host:owner/repo) URL
+_REPO_URL_RE = re.compile(r'(?P<user>[^/:]+)/(?P<repo>[^/]+?)(?:\.git)?/*$')
+
+# requirements.txt: the package name ends at the first specifier/marker/extra
+_RE_REQ_SPEC = re.compile(r'===|==|>=|<=|~=|!=|[<>;\[]')
+
+_RE_EXCLUDE_FILE = re.compile('|'.join(fnmatch.translate(g) for g in EXCLUDE_FILE_GLOBS))
+
+_EXT_LANGUAGES = {
+    '.py': 'Python',
+    '.js': 'Node.js',
+    '.ts': 'Node.js',
+    '.java': 'Java',
+    '.go': 'Go'
+}
+
+# files analyzed for imports/env vars/routes, and files listed in the tree
+_CODE_EXTS = frozenset(_EXT_LANGUAGES)
+_TREE_EXTS = _CODE_EXTS | {'.json', '.xml', '.md', '.yml', '.yaml'}
+
+# Project Structure line prefixes per directory depth shown
+_TREE_DEPTH = 4
+_TREE_DIR_PREFIXES = tuple('│   ' * i + '├── ' for i in range(_TREE_DEPTH))
+_TREE_FILE_PREFIXES = tuple('│   ' * (i + 1) for i in range(_TREE_DEPTH))
+
+
+# ---------- Tree traversal ----------
+
+def _iter_tree(root_path, ignore=None):
+    """Walk root_path depth-first, like os.walk(topdown=True) but on os.scandir.
+
+    Yields (path, rel, name, level, top_service, dir_names, files) per
+    directory. rel is the '/'-separated path below root_path and level its
+    depth, both carried down the stack rather than recomputed from path;
+    files are os.DirEntry objects so their cached type/path are reused.
+    IGNORE_DIRS are pruned before descending, as are directories holding a
+    PRUNE_MARKER_FILES entry and paths matched by ignore(rel_path, is_dir);
+    unreadable directories are skipped.
+    """
+    stack = deque([(root_path, '', '', 0, None)])
+    while stack:
+        path, rel, name, level, top_service = stack.pop()
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORE_DIRS:
+                            dirs.append(entry)
+                    elif entry.is_file():
+                        files.append(entry)
+        except OSError:
+            continue
+
+        if level and any(e.name in PRUNE_MARKER_FILES for e in files):
+            continue
+
+        if ignore is not None:
+            prefix = rel + '/' if rel else ''
+            dirs = [d for d in dirs if not ignore(prefix + d.name, True)]
+            files = [e for e in files if not ignore(prefix + e.name, False)]
+
+        yield path, rel, name, level, top_service, [d.name for d in dirs], files
+
+        # push in reverse so children are visited in scandir order
+        for d in reversed(dirs):
+            child_rel = rel + '/' + d.name if rel else d.name
+            stack.append((d.path, child_rel, d.name, level + 1, top_service or d.name))
+
+
+def _gitignore_regex(pattern):
+    """Regex source for one gitignore glob, matched against a whole path.
+
+    Unlike fnmatch, '*' and '?' stop at '/'; '**/' matches zero or more
+    directories and a trailing '/**' everything below.
+    """
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**', i) and (i == 0 or pattern[i - 1] == '/'):
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if i + 2 == n:
+                out.append('.*')
+                i += 2
+                continue
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        elif c == '[':
+            # '[!...]' negates; a ']' right after '[' or '[!' is literal
+            j = i + 1
+            negate = j < n and pattern[j] in '!^'
+            j += negate
+            end = pattern.find(']', j + 1 if j < n and pattern[j] == ']' else j)
+            if end == -1:
+                out.append('\\[')
+            else:
+                body = re.sub(r'([\\\[\]^&~|])', r'\\\1', pattern[j:end])
+                out.append('[' + ('^' if negate else '') + body + ']')
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out) + r'\Z'
+
+
+def _load_ignore(root_path):
+    """Matcher for root_path/.autodocsignore, or None if there is none.
+
+    Returns ignore(rel_path, is_dir) over '/'-separated paths. Uses pathspec's
+    GitIgnoreSpec when installed; otherwise the common subset of gitignore:
+    'dir/' matches directories only, patterns containing '/' are anchored at
+    the root, others match a name at any depth, and '*', '?', '[...]' and
+    '**' follow gitignore rules. '!' negations need pathspec.
+    """
+    try:
+        with open(os.path.join(root_path, IGNORE_FILE), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    if pathspec is not None:
+        spec = pathspec.GitIgnoreSpec.from_lines(lines)
+        return lambda rel, is_dir: spec.match_file(rel + '/' if is_dir else rel)
+
+    # fused into at most one regex per (dir_only, anchored) kind of rule, so
+    # each path costs a few matches however long the ignore file is
+    groups = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(('#', '!')):
+            continue
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line
+        if dir_only and line.endswith('/**'):
+            line = line[:-3]    # 'x/**/': x and every directory below it
+        groups.setdefault((dir_only, anchored), []).append(_gitignore_regex(line.lstrip('/')))
+    if not groups:
+        return None
+    matchers = [(dir_only, anchored, re.compile('|'.join(patterns)))
+                for (dir_only, anchored), patterns in groups.items()]
+
+    def ignore(rel, is_dir):
+        base = rel.rpartition('/')[2]
+        for dir_only, anchored, regex in matchers:
+            if (is_dir or not dir_only) and regex.match(rel if anchored else base):
+                return True
+        return False
+    return ignore
+
+
+def _file_ext(name):
+    """Lower-cased extension including the dot ('' for none or dotfiles)."""
+    head, dot, tail = name.rpartition('.')
+    return dot + tail.lower() if head else ''
+
+
+def _fast_rmtree(path):
+    """Delete a directory tree with a single rm/rd process.
+
+    Falls back to shutil.rmtree (clearing read-only bits, as git pack
+    files are on Windows) if the command is missing or leaves files behind.
+    """
+    if os.name == 'nt':
+        cmd = ['cmd', '/c', 'rd', '/s', '/q', path]
+    else:
+        cmd = ['rm', '-rf', '--', path]
+    try:
+        subprocess.run(cmd, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        pass
+    if not os.path.exists(path):
+        return
+
+    def on_rm_error(func, path, exc_info):
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    try:
+        shutil.rmtree(path, onerror=on_rm_error)
+    except Exception:
+        pass
+
+
+def _tree_mtime(root_path):
+    """Newest mtime (ns) of any scanned directory or file under root_path."""
+    latest = 0
+    for path, _, _, _, _, _, files in _iter_tree(root_path):
+        latest = max(latest, os.stat(path).st_mtime_ns)
+        for entry in files:
+            latest = max(latest, entry.stat().st_mtime_ns)
+    return latest
+
+
+# ---------- Manifest parsing ----------
+
+_PACKAGE_JSON_FIELDS = ('name', 'main', 'description')
+_PACKAGE_JSON_KEY_MAPS = ('dependencies', 'devDependencies')
+_PACKAGE_JSON_KEYS = frozenset(_PACKAGE_JSON_FIELDS + _PACKAGE_JSON_KEY_MAPS + ('scripts',))
+
+
+def _load_package_json(f):
+    """Read the package.json fields the scanner uses from binary file f.
+
+    Manifests over PACKAGE_JSON_STREAM_BYTES are streamed with ijson: only
+    name/main/description, the scripts map and the *keys* of the dependency
+    maps are materialized, and parsing stops once every one of those keys
+    has been read. Smaller files (or no ijson) are decoded in one go, with
+    orjson when installed.
+    """
+    if ijson is None or os.fstat(f.fileno()).st_size <= PACKAGE_JSON_STREAM_BYTES:
+        return _json_loads(f.read())
+
+    data = {}
+    seen = set()
+    for prefix, event, value in ijson.parse(f):
+        if prefix == '' and event == 'map_key':
+            # the previous top-level value is complete
+            if seen >= _PACKAGE_JSON_KEYS:
+                break
+            if value in _PACKAGE_JSON_KEYS:
+                seen.add(value)
+        elif event == 'map_key' and prefix in _PACKAGE_JSON_KEY_MAPS:
+            data.setdefault(prefix, {})[value] = None
+        elif event == 'string':
+            if prefix in _PACKAGE_JSON_FIELDS:
+                data[prefix] = value
+            elif prefix.startswith('scripts.'):
+                data.setdefault('scripts', {})[prefix[len('scripts.'):]] = value
+    return data
+
+
+# ---------- Scan cache ----------
+
+_SCAN_CACHE = OrderedDict()
+_SCAN_CACHE_LOCK = threading.Lock()   # the Flask server is threaded
+
+
+def _cache_get(key):
+    with _SCAN_CACHE_LOCK:
+        metadata = _SCAN_CACHE.get(key)
+        if metadata is None:
+            return None
+        _SCAN_CACHE.move_to_end(key)
+        return copy.deepcopy(metadata)
+
+
+def _cache_put(key, metadata):
+    with _SCAN_CACHE_LOCK:
+        _SCAN_CACHE[key] = copy.deepcopy(metadata)
+        _SCAN_CACHE.move_to_end(key)
+        while len(_SCAN_CACHE) > SCAN_CACHE_SIZE:
+            _SCAN_CACHE.popitem(last=False)
+
+
+def _disk_cache_path(key):
+    name = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(SCAN_CACHE_DIR, f'v{SCAN_CACHE_VERSION}-{name}.json')
+
+
+def _disk_cache_get(key, template):
+    """Metadata stored for key within SCAN_CACHE_TTL, or None.
+
+    JSON has no sets, so values are converted back wherever the fresh
+    metadata dict `template` holds a set. Entries that lack a key or differ
+    in shape from template (e.g. written by another build) are misses.
+    """
+    if not SCAN_CACHE_DIR:
+        return None
+    try:
+        path = _disk_cache_path(key)
+        if time.time() - os.stat(path).st_mtime > SCAN_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            return _restore_sets(template, _json_loads(f.read()))
+    except Exception:
+        return None
+
+
+def _disk_cache_put(key, metadata):
+    if not SCAN_CACHE_DIR:
+        return
+    tmp = None
+    try:
+        os.makedirs(SCAN_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=SCAN_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, default=sorted)
+        # readers see either the old file or the complete new one
+        os.replace(tmp, _disk_cache_path(key))
+    except Exception:
+        if tmp:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def _restore_sets(template, data):
+    if isinstance(template, set):
+        if not isinstance(data, list):
+            raise TypeError('expected a list for a set')
+        return set(data)
+    if isinstance(template, dict):
+        if not isinstance(data, dict) or not template.keys() <= data.keys():
+            raise KeyError('cached metadata does not match the current layout')
+        return {k: _restore_sets(template[k], v) if k in template else v
+                for k, v in data.items()}
+    return data
+
+
+# ---------- Code analysis (pure, runs in worker processes) ----------
+
+_READ_BUFFERS = threading.local()
+
+# Source files are read through raw descriptors: one os.read per file rather
+# than the buffered file object stack. O_BINARY keeps Windows from
+# translating newlines.
+_O_RDONLY = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+_posix_fadvise = getattr(os, 'posix_fadvise', None)
+
+
+def _read_buffer():
+    """This thread's reusable bytearray for files under MMAP_MIN_BYTES."""
+    buf = getattr(_READ_BUFFERS, 'buf', None)
+    if buf is None:
+        buf = _READ_BUFFERS.buf = bytearray(MMAP_MIN_BYTES)
+    return buf
+
+
+def _readinto(fd, buf):
+    if hasattr(os, 'readv'):
+        return os.readv(fd, [buf])
+    data = os.read(fd, len(buf))
+    buf[:len(data)] = data
+    return len(data)
+
+
+def _new_result(ext):
+    return {
+        "language": _EXT_LANGUAGES[ext],
+        "is_entry": False,
+        "main_class": None,        # Java class holding main()
+        "modules": [],
+        "dependencies": set(),
+        "env_vars": set(),
+        "api_endpoints": set()     # "METHOD /path"
+    }
+
+
+def _analyze_code_worker(filepath, ext):
+    """Analyze a single source file without touching scanner state.
+
+    Returns a dict of findings to be merged by the parent, or None if the
+    file could not be read.
+    """
+    result = _new_result(ext)
+    scan_source = _EXT_HANDLERS[ext]
+    try:
+        fd = os.open(filepath, _O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if size > MAX_ANALYZE_BYTES:
+                return result
+            if size < MMAP_MIN_BYTES:
+                # small files go through one reused buffer instead of a
+                # fresh bytes object per file
+                buf = _read_buffer()
+                scan_source(buf, _readinto(fd, buf), filepath, result)
+            else:
+                # regexes run over the mapped pages; only matches get decoded
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as content:
+                    scan_source(content, size, filepath, result)
+        finally:
+            os.close(fd)
+    except Exception:
+        return None
+    return result
+
+
+def _read_source(filepath):
+    """File contents for _analyze_source (b'' if oversized, None if unreadable)."""
+    try:
+        fd = os.open(filepath, _O_RDONLY)
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        if size > MAX_ANALYZE_BYTES:
+            return b''
+        if _posix_fadvise is not None and size >= MMAP_MIN_BYTES:
+            # multi-page read from start to end: let the kernel read ahead
+            _posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+        # one read of the stat'ed size, so the result stays bounded even if
+        # the file grew in the meantime
+        return os.read(fd, size)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _analyze_source(filepath, ext, content):
+    """Like _analyze_code_worker, for contents already read by _read_source."""
+    if content is None:
+        return None
+    result = _new_result(ext)
+    try:
+        _EXT_HANDLERS[ext](content, len(content), filepath, result)
+    except Exception:
+        return None
+    return result
+
+
+def _scan_python(content, end, filepath, result):
+    modules = result["modules"]
+    deps = result["dependencies"]
+    env_vars = result["env_vars"]
+    endpoints = result["api_endpoints"]
+
+    is_routes = os.path.basename(filepath) in ('urls.py', 'routes.py')
+    for m in _RE_PY_SCAN.finditer(content, 0, end):
+        i = m.lastindex
+        kind = _PY_KINDS[i]
+        if kind == 'cls':
+            modules.append(_text(m.group(i + 1)))
+        elif kind == 'imp':
+            imp = _text(m.group(i + 1))
+            if imp not in STD_LIBS['python']:
+                deps.add(imp)
+        elif kind == 'env':
+            env_vars.add(_env_name(m, i))
+        elif kind == 'route':
+            endpoints.add(f"{_text(m.group(i + 1)).upper()} {_text(m.group(i + 2))}")
+        elif kind == 'flask':
+            path = _text(m.group(i + 1))
+            for method in _RE_HTTP_METHOD.findall(m.group(i + 2)):
+                endpoints.add(f"{_text(method).upper()} {path}")
+        elif kind == 'django':
+            if is_routes:
+                endpoints.add("* /" + _text(m.group(i + 1)).strip('/ '))
+        elif kind == 'entry':
+            result["is_entry"] = True
+
+
+def _scan_js(content, end, filepath, result):
+    deps = result["dependencies"]
+    env_vars = result["env_vars"]
+    endpoints = result["api_endpoints"]
+
+    for m in _RE_JS_SCAN.finditer(content, 0, end):
+        i = m.lastindex
+        kind = _JS_KINDS[i]
+        if kind == 'imp':
+            imp = _text(m.group(i + 1))
+            if imp.startswith('.'):
+                continue
+            # package name: 'lodash/fp' -> 'lodash', '@scope/pkg/sub' -> '@scope/pkg'
+            pkg = '/'.join(imp.split('/', 2)[:2]) if imp.startswith('@') else imp.split('/', 1)[0]
+            if pkg not in STD_LIBS['node']:
+                deps.add(pkg)
+        elif kind == 'env':
+            env_vars.add(_env_name(m, i))
+        elif kind == 'route':
+            endpoints.add(f"{_text(m.group(i + 1)).upper()} {_text(m.group(i + 2))}")
+        elif kind == 'entry':
+            result["is_entry"] = True
+
+
+def _scan_go(content, end, filepath, result):
+    deps = result["dependencies"]
+    env_vars = result["env_vars"]
+
+    for m in _RE_GO_SCAN.finditer(content, 0, end):
+        i = m.lastindex
+        kind = _GO_KINDS[i]
+        if kind == 'imp':
+            imp = _text(m.group(i + 1))
+            # crude heuristic: external packages usually contain dots or slashes
+            if '.' in imp or '/' in imp:
+                deps.add(imp)
+        elif kind == 'env':
+            env_vars.add(_env_name(m, i))
+        elif kind == 'entry':
+            result["is_entry"] = True
+
+
+def _scan_java(content, end, filepath, result):
+    deps = result["dependencies"]
+    env_vars = result["env_vars"]
+
+    first_class = None
+    has_main = False
+    for m in _RE_JAVA_SCAN.finditer(content, 0, end):
+        i = m.lastindex
+        kind = _JAVA_KINDS[i]
+        if kind == 'cls':
+            if first_class is None:
+                first_class = _text(m.group(i + 1))
+        elif kind == 'imp':
+            imp = _text(m.group(i + 1))
+            if not imp.startswith(JAVA_STD_PREFIXES):
+                deps.add(imp)
+        elif kind == 'env':
+            env_vars.add(_env_name(m, i))
+        elif kind == 'entry':
+            has_main = True
+
+    if first_class:
+        result["modules"].append(first_class)
+
+    if has_main:
+        result["is_entry"] = True
+        result["main_class"] = first_class
+
+
+# ext -> scanner; each fills the result dict from content[:end] (bytes,
+# bytearray or mmap) in one regex pass, entry-point markers included.
+# Add a language by registering it here and in _EXT_LANGUAGES.
+_EXT_HANDLERS = {
+    '.py': _scan_python,
+    '.js': _scan_js,
+    '.ts': _scan_js,
+    '.go': _scan_go,
+    '.java': _scan_java,
 }
 
 
+def _text(raw):
+    return raw.decode('utf-8', 'ignore')
+
+
+def _env_name(m, i):
+    # the env branch holds one alternative group per access style
+    return _text(m.group(i + 1) or m.group(i + 2) or m.group(i + 3) or m.group(i + 4))
+
+
+# Both pools are shared so concurrent scans (one per /generate request)
+# queue for the same READ_THREADS threads and ANALYZE_WORKERS processes
+# instead of each starting their own.
+_READ_POOL = ThreadPoolExecutor(max_workers=READ_THREADS)   # threads start on demand
+
+_ANALYSIS_POOL = None
+_ANALYSIS_POOL_LOCK = threading.Lock()
+
+
+def _analysis_pool():
+    """The worker pool shared by every scan, created on first use.
+
+    Workers start from forkserver (spawn where that is missing), not fork:
+    scans run in a process that already has reader and request threads.
+    """
+    global _ANALYSIS_POOL
+    with _ANALYSIS_POOL_LOCK:
+        if _ANALYSIS_POOL is None:
+            if os.name == 'nt':
+                # spawn makes processes expensive on Windows; threads still overlap I/O
+                _ANALYSIS_POOL = ThreadPoolExecutor(max_workers=ANALYZE_WORKERS)
+            else:
+                methods = multiprocessing.get_all_start_methods()
+                ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                if ctx.get_start_method() == 'forkserver':
+                    # workers fork from a server that already imported this module
+                    ctx.set_forkserver_preload([__name__])
+                _ANALYSIS_POOL = ProcessPoolExecutor(max_workers=ANALYZE_WORKERS, mp_context=ctx)
+        return _ANALYSIS_POOL
+
+
+def _discard_analysis_pool(pool):
+    """Forget a broken pool so the next scan starts a fresh one."""
+    global _ANALYSIS_POOL
+    with _ANALYSIS_POOL_LOCK:
+        if _ANALYSIS_POOL is pool:
+            _ANALYSIS_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
 class DeepScanner:
     def __init__(self, path, custom_context=""):
         self.original_path = path
@@ -41,6 +859,7 @@ class DeepScanner:
 
         # internal helpers
         self._service_info = {}      # top-level folder -> info
+        self._modules_seen = set()   # dedup for metadata["modules"] (a list, in discovery order)
         self._api_endpoint_set = set()
 
         self.metadata = {
@@ -120,13 +939,13 @@ class DeepScanner:
         if self.is_remote:
             self.temp_dir = tempfile.mkdtemp()
             try:
-                git.Repo.clone_from(self.original_path, self.temp_dir)
+                self._clone()
                 self.path = self.temp_dir
                 self.metadata["repo_url"] = self.original_path
-                parts = self.original_path.rstrip('/').split('/')
-                if len(parts) >= 2:
-                    self.metadata["repo_name"] = parts[-1].replace('.git', '')
-                    self.metadata["username"] = parts[-2]
+                m = _REPO_URL_RE.search(self.original_path)
+                if m:
+                    self.metadata["repo_name"] = m['repo']
+                    self.metadata["username"] = m['user']
                     self.metadata["project_name"] = self.metadata["repo_name"]
             except Exception as e:
                 self.cleanup()
@@ -139,22 +958,66 @@ class DeepScanner:
                 repo = git.Repo(self.path)
                 url = repo.remotes.origin.url
                 self.metadata["repo_url"] = url
-                parts = url.rstrip('/').replace('.git', '').split('/')
-                self.metadata["repo_name"] = parts[-1]
-                self.metadata["username"] = parts[-2].split(':')[-1]
+                m = _REPO_URL_RE.search(url)
+                if m:
+                    self.metadata["repo_name"] = m['repo']
+                    self.metadata["username"] = m['user']
             except Exception:
                 pass
         return self.path
 
-    def cleanup(self):
-        if self.temp_dir and os.path.exists(self.temp_dir):
+    def _clone(self):
+        # Only the current tree is needed: skip history, other refs, tags and,
+        # where the server supports partial clone, blobs never checked out
+        env = {'GIT_TERMINAL_PROMPT': '0'}   # fail fast instead of prompting for credentials
+        try:
+            git.Repo.clone_from(self.original_path, self.temp_dir, env=env, depth=1,
+                                multi_options=['--filter=blob:none', '--single-branch', '--no-tags'])
+        except git.GitCommandError as e:
+            # Only a rejected --filter is worth a plain shallow retry; a bad URL,
+            # missing auth or network failure would just fail a second time
+            stderr = str(e.stderr).lower()
+            if 'filter' not in stderr and 'not support' not in stderr:
+                raise
+            _fast_rmtree(self.temp_dir)
+            os.makedirs(self.temp_dir)
+            git.Repo.clone_from(self.original_path, self.temp_dir, env=env, depth=1,
+                                multi_options=['--single-branch', '--no-tags'])
+
+    def cache_key(self):
+        """Identify the exact tree to be scanned, without cloning it.
+
+        Remote repos use `git ls-remote` for the HEAD sha. Clean local git
+        checkouts use their HEAD commit; anything else uses the newest mtime
+        in the tree. Returns None when no key can be determined.
+        """
+        try:
+            if self.is_remote:
+                out = git.Git().ls_remote(self.original_path, 'HEAD',
+                                          env={'GIT_TERMINAL_PROMPT': '0'})
+                return (self.original_path, out.split()[0]) if out else None
+
+            abs_path = os.path.abspath(self.path)
             try:
-                def on_rm_error(func, path, exc_info):
-                    os.chmod(path, stat.S_IWRITE)
-                    func(path)
-                shutil.rmtree(self.temp_dir, onerror=on_rm_error)
+                repo = git.Repo(abs_path)
+                if not repo.is_dirty(untracked_files=True):
+                    return (abs_path, repo.head.commit.hexsha)
             except Exception:
                 pass
+            return (abs_path, _tree_mtime(abs_path))
+        except Exception:
+            return None
+
+    def cleanup(self, background=False):
+        """Remove the clone directory; with background=True, don't wait for it."""
+        # temp_dir is only set once mkdtemp has created it; clearing it makes
+        # a second cleanup() a no-op without stat'ing the path again
+        temp_dir, self.temp_dir = self.temp_dir, None
+        if temp_dir:
+            if background:
+                threading.Thread(target=_fast_rmtree, args=(temp_dir,)).start()
+            else:
+                _fast_rmtree(temp_dir)
 
     def scan(self):
         self._scan_license()
@@ -212,54 +1075,55 @@ class DeepScanner:
         return desc
 
     def _scan_license(self):
-        for f in os.listdir(self.path):
-            if f.upper().startswith('LICENSE') or f.upper().startswith('COPYING'):
-                try:
-                    with open(os.path.join(self.path, f), 'r', encoding="utf-8", errors="ignore") as lic_file:
-                        content = lic_file.read(200).upper()
-                        if "MIT" in content:
-                            self.metadata["license"] = "MIT"
-                        elif "APACHE" in content:
-                            self.metadata["license"] = "Apache 2.0"
-                        elif "GNU" in content or "GPL" in content:
-                            self.metadata["license"] = "GPL"
-                        else:
-                            self.metadata["license"] = "See LICENSE file"
-                except Exception:
-                    pass
-                break
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    # is_file() is answered from the scandir entry, no stat
+                    if _RE_LICENSE_FILE.match(entry.name) and entry.is_file():
+                        break
+                else:
+                    return
+        except OSError:
+            return
+        try:
+            with open(entry.path, 'rb') as lic_file:
+                m = _LICENSE_RE.search(lic_file.read(LICENSE_HEAD_BYTES))
+            if m:
+                self.metadata["license"] = _LICENSE_NAMES[m.group(1).upper()]
+            else:
+                self.metadata["license"] = "See LICENSE file"
+        except Exception:
+            pass
 
     # ---------- Tree / file scanning ----------
 
     def _scan_tree(self, root_path):
         tree_lines = []
+        code_files = []     # (filepath, ext) analyzed after the walk
+        prefetched = []     # reads started during the walk, parallel to code_files
+        queued_bytes = {}   # top-level dir -> source bytes queued so far
         stats = self.metadata["stats"]
 
-        for root, dirs, files in os.walk(root_path):
-            # Filter out ignored dirs
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-
-            rel_path = os.path.relpath(root, root_path)
-            level = 0 if rel_path == '.' else rel_path.count(os.sep) + 1
-
-            # CI detection via directory structure
-            if root.endswith(os.path.join('.github')) and 'workflows' in dirs:
-                stats["has_ci"] = True
-
-            # Tree representation
-            if level < 4:
-                indent = '│   ' * level
-                subindent = '├── '
-                if level > 0:
-                    tree_lines.append(f"{indent}{subindent}{os.path.basename(root)}/")
-                for f in files:
-                    if f.endswith(('.java', '.py', '.js', '.ts', '.go', '.json', '.xml', '.md', '.yml', '.yaml')):
-                        tree_lines.append(f"{indent}│   {f}")
-
-            # Top-level service detection (monorepo-ish)
-            if rel_path != '.':
-                top_service = rel_path.split(os.sep)[0]
-                if top_service not in self._service_info:
+        try:
+            ignore = _load_ignore(root_path)
+            for root, rel, name, level, top_service, dirs, files in _iter_tree(root_path, ignore):
+                # CI detection via directory structure
+                if name == '.github' and 'workflows' in dirs:
+                    stats["has_ci"] = True
+
+                # Directory names above these files, relative to the scan root
+                # (split once per directory, not per file)
+                dir_parts = frozenset(rel.split('/'))
+
+                # Tree representation (files are listed in the loop below)
+                in_tree = level < _TREE_DEPTH
+                if in_tree:
+                    file_prefix = _TREE_FILE_PREFIXES[level]
+                    if level > 0:
+                        tree_lines.append(_TREE_DIR_PREFIXES[level] + name + '/')
+
+                # Top-level service detection (monorepo-ish)
+                if top_service and top_service not in self._service_info:
                     self._service_info[top_service] = {
                         "path": top_service,
                         "has_package_json": False,
@@ -267,99 +1131,129 @@ class DeepScanner:
                         "has_pom": False,
                         "has_go_mod": False
                     }
-            else:
-                top_service = None
 
-            for f in files:
-                filepath = os.path.join(root, f)
-                ext = os.path.splitext(f)[1].lower()
+                for entry in files:
+                    f = entry.name
+                    filepath = entry.path
+                    ext = _file_ext(f)
+
+                    if in_tree and ext in _TREE_EXTS:
+                        tree_lines.append(file_prefix + f)
+
+                    # CI, lint, Docker and build configs by file name
+                    handler = _FILENAME_HANDLERS.get(f)
+                    if handler is not None:
+                        handler(self, filepath, top_service)
+                    elif f.startswith('.eslintrc'):
+                        stats["linting"].add("JavaScript/TypeScript")
+
+                    # Code Analysis
+                    if ext in _CODE_EXTS:
+                        # stats: file counts
+                        stats["files"][_EXT_LANGUAGES[ext]] += 1
+
+                        # test file heuristics
+                        if ext == '.py':
+                            if (f.startswith('test_') or f.endswith('_test.py') or
+                                    'tests' in dir_parts):
+                                stats["test_files"] += 1
+                        elif ext in ('.js', '.ts'):
+                            if (f.endswith(('.test.js', '.spec.js', '.test.ts', '.spec.ts')) or
+                                    '__tests__' in dir_parts):
+                                stats["test_files"] += 1
+
+                        # Skip generated and oversized files before opening them
+                        if _RE_EXCLUDE_FILE.match(f):
+                            continue
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:
+                            continue
+                        if size > MAX_ANALYZE_BYTES:
+                            continue
+                        budget = queued_bytes.get(top_service, 0) + size
+                        if budget > MAX_SUBTREE_BYTES:
+                            continue
+                        queued_bytes[top_service] = budget
+                        code_files.append((filepath, ext))
+                        # small repos are analyzed in this process: start the read
+                        # now so disk latency overlaps the rest of the walk
+                        if prefetched is not None:
+                            if len(code_files) < PARALLEL_MIN_FILES:
+                                prefetched.append(_READ_POOL.submit(_read_source, filepath))
+                            else:
+                                # the worker pool reads every file itself: drop
+                                # the queued reads rather than hold their bytes
+                                for future in prefetched:
+                                    future.cancel()
+                                prefetched = None
+
+            self._analyze_files(code_files, prefetched)
+        finally:
+            # the pool outlives this scan: don't leave its reads queued there
+            for future in prefetched or ():
+                future.cancel()
+        self.metadata["structure"] = "```text\n.\n" + "\n".join(tree_lines) + "\n```"
 
-                # CI configs by file name
-                if f in ('circle.yml', '.gitlab-ci.yml', 'azure-pipelines.yml',
-                         'bitbucket-pipelines.yml', '.travis.yml'):
-                    stats["has_ci"] = True
+    # ---------- Named config / manifest files (see _FILENAME_HANDLERS) ----------
 
-                # Linting configs
-                lint = stats["linting"]
-                if f.startswith('.eslintrc') or f in ('.prettierrc', '.prettierrc.js', '.prettierrc.json'):
-                    lint.add("JavaScript/TypeScript")
-                if f in ('pylintrc', '.flake8'):
-                    lint.add("Python")
-                if f == 'pyproject.toml':
-                    lint.add("Python (pyproject)")
-
-                # Docker detection
-                if f == 'Dockerfile':
-                    self.metadata["docker"]["dockerfile"] = True
-                if f in ('docker-compose.yml', 'docker-compose.yaml'):
-                    self.metadata["docker"]["compose"] = True
-
-                # Config & Build Tools
-                if f == 'package.json':
-                    if self.metadata["node_package_json_path"] is None:
-                        self.metadata["node_package_json_path"] = os.path.relpath(filepath, self.path)
-                    self.metadata["languages"].add("Node.js")
-                    if top_service:
-                        self._service_info[top_service]["has_package_json"] = True
-                    self._parse_package_json(filepath)
-
-                elif f == 'requirements.txt':
-                    if self.metadata["python_requirements_path"] is None:
-                        self.metadata["python_requirements_path"] = os.path.relpath(filepath, self.path)
-                    self.metadata["languages"].add("Python")
-                    if top_service:
-                        self._service_info[top_service]["has_requirements"] = True
-                    self._parse_requirements(filepath)
-
-                elif f == 'pom.xml':
-                    self.metadata["languages"].add("Java")
-                    self.metadata["build_tools"].add("Maven")
-                    if top_service:
-                        self._service_info[top_service]["has_pom"] = True
-
-                elif f == 'build.gradle':
-                    self.metadata["languages"].add("Java")
-                    self.metadata["build_tools"].add("Gradle")
-
-                elif f == 'go.mod':
-                    self.metadata["languages"].add("Go")
-                    if self.metadata["go_mod_path"] is None:
-                        self.metadata["go_mod_path"] = os.path.relpath(filepath, self.path)
-                    if top_service:
-                        self._service_info[top_service]["has_go_mod"] = True
-
-                # Code Analysis
-                if ext in ['.py', '.js', '.ts', '.java', '.go']:
-                    # stats: file counts
-                    if ext == '.py':
-                        stats["files"]["Python"] += 1
-                    elif ext in ['.js', '.ts']:
-                        stats["files"]["Node.js"] += 1
-                    elif ext == '.java':
-                        stats["files"]["Java"] += 1
-                    elif ext == '.go':
-                        stats["files"]["Go"] += 1
-
-                    # test file heuristics
-                    if ext == '.py':
-                        if (f.startswith('test_') or f.endswith('_test.py') or
-                                'tests' in root.split(os.sep)):
-                            stats["test_files"] += 1
-                    elif ext in ['.js', '.ts']:
-                        if (f.endswith(('.test.js', '.spec.js', '.test.ts', '.spec.ts')) or
-                                '__tests__' in root.split(os.sep)):
-                            stats["test_files"] += 1
-
-                    self._analyze_code(filepath, ext)
+    def _on_ci_config(self, filepath, top_service):
+        self.metadata["stats"]["has_ci"] = True
 
-        self.metadata["structure"] = "```text\n.\n" + "\n".join(tree_lines) + "\n```"
+    def _on_js_lint_config(self, filepath, top_service):
+        self.metadata["stats"]["linting"].add("JavaScript/TypeScript")
+
+    def _on_py_lint_config(self, filepath, top_service):
+        self.metadata["stats"]["linting"].add("Python")
+
+    def _on_pyproject(self, filepath, top_service):
+        self.metadata["stats"]["linting"].add("Python (pyproject)")
+
+    def _on_dockerfile(self, filepath, top_service):
+        self.metadata["docker"]["dockerfile"] = True
+
+    def _on_compose_file(self, filepath, top_service):
+        self.metadata["docker"]["compose"] = True
+
+    def _on_package_json(self, filepath, top_service):
+        if self.metadata["node_package_json_path"] is None:
+            self.metadata["node_package_json_path"] = os.path.relpath(filepath, self.path)
+        self.metadata["languages"].add("Node.js")
+        if top_service:
+            self._service_info[top_service]["has_package_json"] = True
+        self._parse_package_json(filepath)
+
+    def _on_requirements(self, filepath, top_service):
+        if self.metadata["python_requirements_path"] is None:
+            self.metadata["python_requirements_path"] = os.path.relpath(filepath, self.path)
+        self.metadata["languages"].add("Python")
+        if top_service:
+            self._service_info[top_service]["has_requirements"] = True
+        self._parse_requirements(filepath)
+
+    def _on_pom(self, filepath, top_service):
+        self.metadata["languages"].add("Java")
+        self.metadata["build_tools"].add("Maven")
+        if top_service:
+            self._service_info[top_service]["has_pom"] = True
+
+    def _on_gradle(self, filepath, top_service):
+        self.metadata["languages"].add("Java")
+        self.metadata["build_tools"].add("Gradle")
+
+    def _on_go_mod(self, filepath, top_service):
+        self.metadata["languages"].add("Go")
+        if self.metadata["go_mod_path"] is None:
+            self.metadata["go_mod_path"] = os.path.relpath(filepath, self.path)
+        if top_service:
+            self._service_info[top_service]["has_go_mod"] = True
 
     # ---------- Parse manifest files ----------
 
     def _parse_package_json(self, filepath):
         try:
-            with open(filepath, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = _load_package_json(f)
                 if data.get('name'):
                     self.metadata["project_name"] = data.get('name')
 
@@ -380,7 +1274,7 @@ class DeepScanner:
 
                 # Detect Testing Frameworks
                 for d in deps + devDeps:
-                    if d in ['jest', 'mocha', 'chai', 'supertest']:
+                    if d in NODE_TEST_DEPS:
                         self.metadata["tests"].append(d)
         except Exception:
             pass
@@ -388,165 +1282,74 @@ class DeepScanner:
     def _parse_requirements(self, filepath):
         try:
             with open(filepath, encoding="utf-8") as f:
-                deps = [
-                    line.split('==')[0].strip()
-                    for line in f
-                    if line.strip() and not line.strip().startswith('#')
-                ]
+                # skip comments and pip options (-r, -e, --index-url, ...)
+                deps = {
+                    _RE_REQ_SPEC.split(line, 1)[0].strip()
+                    for line in map(str.strip, f)
+                    if line and not line.startswith(('#', '-'))
+                }
+                deps.discard('')
                 self.metadata["dependencies"]["Python"].update(deps)
-                for d in deps:
-                    if d in ['pytest', 'unittest', 'nose', 'mock']:
-                        self.metadata["tests"].append(d)
+                self.metadata["tests"].extend(sorted(deps & PYTHON_TEST_DEPS))
         except Exception:
             pass
 
     # ---------- Code analysis ----------
 
-    def _analyze_code(self, filepath, ext):
-        try:
-            with open(filepath, 'r', errors='ignore', encoding='utf-8') as f:
-                content = f.read()
-                fname = os.path.basename(filepath)
-
-                # --- PYTHON ---
-                if ext == '.py':
-                    self.metadata["languages"].add("Python")
-
-                    if ('if __name__ == "__main__":' in content or 'app.run(' in content):
-                        if not self.metadata["entry_points"]["Python"]:
-                            self.metadata["entry_points"]["Python"] = fname
-                        if not self.metadata["entry_point"]:
-                            self.metadata["entry_point"] = fname
-
-                    classes = re.findall(r'class\s+(\w+)', content)
-                    for c in classes:
-                        self.metadata["modules"].append(c)
-
-                    imports = re.findall(r'^(?:from|import)\s+([\w\.]+)', content, re.MULTILINE)
-                    for imp in imports:
-                        root_imp = imp.split('.')[0]
-                        if root_imp not in STD_LIBS['python']:
-                            self.metadata["dependencies"]["Python"].add(root_imp)
-
-                # --- NODE.JS / TS ---
-                elif ext in ['.js', '.ts']:
-                    self.metadata["languages"].add("Node.js")
-
-                    if 'app.listen' in content or 'server.listen' in content:
-                        if not self.metadata["entry_points"]["Node.js"]:
-                            self.metadata["entry_points"]["Node.js"] = fname
-                        if not self.metadata["entry_point"]:
-                            self.metadata["entry_point"] = fname
-
-                    imports = re.findall(r'(?:require|from)\s*[\'"]([@\w./-]+)[\'"]', content)
-                    for imp in imports:
-                        if not imp.startswith('.') and imp.split('/')[0] not in STD_LIBS['node']:
-                            self.metadata["dependencies"]["Node.js"].add(imp.split('/')[0])
-
-                # --- GO ---
-                elif ext == '.go':
-                    self.metadata["languages"].add("Go")
-
-                    if 'func main()' in content:
-                        if not self.metadata["entry_points"]["Go"]:
-                            self.metadata["entry_points"]["Go"] = fname
-                        if not self.metadata["entry_point"]:
-                            self.metadata["entry_point"] = fname
-
-                    imports = re.findall(r'"([\w/\.]+)"', content)
-                    for imp in imports:
-                        # crude heuristic: external packages usually contain dots or slashes
-                        if '.' in imp or '/' in imp:
-                            self.metadata["dependencies"]["Go"].add(imp)
-
-                # --- JAVA ---
-                elif ext == '.java':
-                    self.metadata["languages"].add("Java")
-
-                    class_match = re.search(r'class\s+(\w+)', content)
-                    if class_match:
-                        self.metadata["modules"].append(class_match.group(1))
-
-                    if "public static void main" in content:
-                        if not self.metadata["entry_points"]["Java"]:
-                            self.metadata["entry_points"]["Java"] = fname
-                        if not self.metadata["entry_point"]:
-                            self.metadata["entry_point"] = fname
-                        if class_match:
-                            self.metadata["entry_point_cmd"] = class_match.group(1)
-
-                    imports = re.findall(r'import\s+([\w\.]+);', content)
-                    for imp in imports:
-                        if not any(imp.startswith(std) for std in ['java.lang', 'java.util', 'java.io']):
-                            self.metadata["dependencies"]["Java"].add(imp)
-
-                # Env Vars (Universal)
-                self._detect_env_vars(content)
-
-                # API endpoints
-                self._detect_api_endpoints(content, ext, filepath)
+    def _analyze_files(self, code_files, prefetched):
+        """Analyze collected (filepath, ext) pairs, in parallel for big repos.
 
-        except Exception:
-            pass
+        prefetched holds _read_source futures submitted during the walk; for
+        repos below PARALLEL_MIN_FILES there is one per file and this thread
+        only scans and merges, in walk order. Larger repos pass None.
+        """
+        paths = [p for p, _ in code_files]
+        exts = [e for _, e in code_files]
 
-    def _detect_env_vars(self, content):
-        # process.env.VAR, os.environ["VAR"], os.environ.get("VAR"), os.getenv("VAR")
-        pattern = (
-            r'process\.env\.([A-Z_][A-Z0-9_]*)'
-            r'|os\.environ\[\s*[\'"]([A-Z_][A-Z0-9_]*)[\'"]\s*\]'
-            r'|os\.environ\.get\(\s*[\'"]([A-Z_][A-Z0-9_]*)[\'"]'
-            r'|os\.getenv\(\s*[\'"]([A-Z_][A-Z0-9_]*)[\'"]'
-        )
-        matches = re.findall(pattern, content)
-        for group in matches:
-            for name in group:
-                if name:
-                    self.metadata["env_vars"].add(name)
-
-    def _detect_api_endpoints(self, content, ext, filepath):
-        # Very heuristic, but good enough for auto-doc starting point
-        endpoints = set()
-
-        if ext == '.py':
-            # FastAPI style: @app.get("/path")
-            for method, path in re.findall(
-                r'@app\.(get|post|put|delete|patch|options|head)\(\s*[\'"]([^\'"]+)[\'"]',
-                content,
-                flags=re.IGNORECASE
-            ):
-                endpoints.add(f"{method.upper()} {path}")
-
-            # Flask: @app.route("/path", methods=["GET","POST"])
-            for path, methods in re.findall(
-                r'@app\.route\(\s*[\'"]([^\'"]+)[\'"]\s*,\s*methods\s*=\s*\[([^\]]+)\]',
-                content
-            ):
-                for m in re.findall(r'[\'"]([A-Z]+)[\'"]', methods):
-                    endpoints.add(f"{m.upper()} {path}")
-
-            # Django urls.py: path("users/", ...)
-            fname = os.path.basename(filepath)
-            if fname in ('urls.py', 'routes.py'):
-                for path in re.findall(r'path\(\s*[\'"]([^\'"]+)[\'"]', content):
-                    clean = "/" + path.strip('/ ')
-                    endpoints.add(f"* {clean}")
-
-        elif ext in ['.js', '.ts']:
-            # Express: app.get('/path', ...), router.post('/path', ...)
-            for method, path in re.findall(
-                r'\bapp\.(get|post|put|delete|patch|options|head)\(\s*[\'"]([^\'"]+)[\'"]',
-                content,
-                flags=re.IGNORECASE
-            ):
-                endpoints.add(f"{method.upper()} {path}")
-            for method, path in re.findall(
-                r'\brouter\.(get|post|put|delete|patch|options|head)\(\s*[\'"]([^\'"]+)[\'"]',
-                content,
-                flags=re.IGNORECASE
-            ):
-                endpoints.add(f"{method.upper()} {path}")
-
-        for ep in sorted(endpoints):
+        if len(code_files) < PARALLEL_MIN_FILES:
+            for filepath, ext, future in zip(paths, exts, prefetched):
+                result = _analyze_source(filepath, ext, future.result())
+                if result:
+                    self._merge_analysis(filepath, result)
+            return
+
+        pool = None
+        try:
+            pool = _analysis_pool()
+            results = list(pool.map(_analyze_code_worker, paths, exts, chunksize=32))
+        except Exception as e:
+            # e.g. multiprocessing unavailable on this host, or a worker died
+            if isinstance(e, BrokenExecutor):
+                _discard_analysis_pool(pool)
+            results = map(_analyze_code_worker, paths, exts)
+
+        # Merge in walk order so "first entry point found" stays deterministic
+        for filepath, result in zip(paths, results):
+            if result:
+                self._merge_analysis(filepath, result)
+
+    def _merge_analysis(self, filepath, result):
+        fname = os.path.basename(filepath)
+        lang = result["language"]
+        self.metadata["languages"].add(lang)
+
+        if result["is_entry"]:
+            if not self.metadata["entry_points"][lang]:
+                self.metadata["entry_points"][lang] = fname
+            if not self.metadata["entry_point"]:
+                self.metadata["entry_point"] = fname
+            if result["main_class"]:
+                self.metadata["entry_point_cmd"] = result["main_class"]
+
+        modules_seen = self._modules_seen
+        for mod in result["modules"]:
+            if mod not in modules_seen:
+                modules_seen.add(mod)
+                self.metadata["modules"].append(mod)
+        self.metadata["dependencies"][lang].update(result["dependencies"])
+        self.metadata["env_vars"].update(result["env_vars"])
+
+        for ep in sorted(result["api_endpoints"]):
             if ep not in self.metadata["api_endpoints"]:
                 self.metadata["api_endpoints"].append(ep)
 
@@ -557,71 +1360,19 @@ class DeepScanner:
         m = self.metadata
         details = m["tech_stack_details"]
 
-        py_deps = {d.lower() for d in m["dependencies"]["Python"]}
-        node_deps = {d.lower() for d in m["dependencies"]["Node.js"]}
-        java_deps = {d.lower() for d in m["dependencies"]["Java"]}
-        go_deps = {d.lower() for d in m["dependencies"]["Go"]}
-
-        # Frameworks
-        if 'django' in py_deps:
-            details["frameworks"].add("Django")
-        if 'flask' in py_deps:
-            details["frameworks"].add("Flask")
-        if 'fastapi' in py_deps:
-            details["frameworks"].add("FastAPI")
-
-        if 'express' in node_deps:
-            details["frameworks"].add("Express")
-        if 'next' in node_deps or 'next.js' in node_deps:
-            details["frameworks"].add("Next.js")
-        if 'nuxt' in node_deps or 'nuxt.js' in node_deps:
-            details["frameworks"].add("Nuxt.js")
-        if 'nest' in node_deps or 'nestjs' in node_deps:
-            details["frameworks"].add("NestJS")
-        if 'koa' in node_deps:
-            details["frameworks"].add("Koa")
-
-        if any('spring' in d for d in java_deps):
+        # one dict lookup per dependency instead of a keyword check per tech;
+        # names are only lower-cased (copied) when they are not already
+        for lang, signatures in _TECH_SIGNATURES.items():
+            for dep in m["dependencies"][lang]:
+                sig = signatures.get(dep)
+                if sig is None and not dep.islower():
+                    sig = signatures.get(dep.lower())
+                for category, label in sig or ():
+                    details[category].add(label)
+
+        if any(_RE_SPRING.search(d) for d in m["dependencies"]["Java"]):
             details["frameworks"].add("Spring/Spring Boot")
 
-        if 'gin' in go_deps:
-            details["frameworks"].add("Gin")
-        if 'echo' in go_deps:
-            details["frameworks"].add("Echo")
-
-        # Databases
-        if {'psycopg2', 'psycopg2-binary'} & py_deps:
-            details["databases"].add("PostgreSQL")
-        if 'mysqlclient' in py_deps or 'pymysql' in py_deps:
-            details["databases"].add("MySQL")
-        if 'pymongo' in py_deps or 'motor' in py_deps:
-            details["databases"].add("MongoDB")
-        if 'sqlalchemy' in py_deps:
-            details["databases"].add("SQL (SQLAlchemy)")
-
-        if 'mongoose' in node_deps:
-            details["databases"].add("MongoDB")
-        if 'pg' in node_deps or 'pg-promise' in node_deps:
-            details["databases"].add("PostgreSQL")
-        if 'mysql2' in node_deps:
-            details["databases"].add("MySQL")
-        if 'redis' in node_deps or 'ioredis' in node_deps:
-            details["databases"].add("Redis")
-
-        # Auth
-        if 'jsonwebtoken' in node_deps or 'jwt' in py_deps:
-            details["auth"].add("JWT")
-        if 'passport' in node_deps:
-            details["auth"].add("Passport.js")
-        if 'django-allauth' in py_deps:
-            details["auth"].add("Django Allauth")
-        if 'djangorestframework-simplejwt' in py_deps:
-            details["auth"].add("DRF + JWT")
-
-        # Cache
-        if 'redis' in node_deps or 'ioredis' in node_deps or 'redis' in py_deps:
-            details["cache"].add("Redis")
-
         # Mirror into flat tech_stack labels
         for fw in details["frameworks"]:
             m["tech_stack"].add(f"Framework: {fw}")
@@ -654,7 +1405,7 @@ class DeepScanner:
 
     def generate_diagrams(self):
         # 1. Component Architecture (Graph)
-        chart = "```mermaid\ngraph TD\n"
+        parts = ["### Component Architecture\n```mermaid\ngraph TD\n"]
 
         # Scenario A: Java/Python Class Diagram
         if ("Java" in self.metadata["languages"] or "Python" in self.metadata["languages"]) and self.metadata["modules"]:
@@ -664,201 +1415,203 @@ class DeepScanner:
             if isinstance(entry, str) and (entry.endswith('.py') or entry.endswith('.java')):
                 entry = entry.split('.')[0]
 
-            chart += f"    {entry} --> Logic_Layer\n"
+            parts.append(f"    {entry} --> Logic_Layer\n")
             for mod in self.metadata["modules"][:6]:
                 if mod != entry:
-                    chart += f"    Logic_Layer --> {mod}\n"
+                    parts.append(f"    Logic_Layer --> {mod}\n")
 
         # Scenario B: Node/Go Component Diagram
         else:
-            chart += "    User[User] --> UI[Client]\n"
+            parts.append("    User[User] --> UI[Client]\n")
             backend = self.metadata["entry_point"] or "Server"
-            chart += f"    UI --> {backend}\n"
+            parts.append(f"    UI --> {backend}\n")
 
-            # Map Frameworks/DBs
-            for dep in (self.metadata["dependencies"].get("Node.js", set()) |
-                        self.metadata["dependencies"].get("Python", set())):
-                if dep in ['mongoose', 'mongodb', 'pg', 'mysql', 'mysql2', 'sequelize']:
-                    chart += f"    {backend} --> {dep}[({dep} DB)]\n"
-                elif dep in ['redis', 'ioredis']:
-                    chart += f"    {backend} --> {dep}(({dep} Cache))\n"
+            # Map Frameworks/DBs (a package used from both languages is drawn once)
+            node_deps = self.metadata["dependencies"].get("Node.js", ())
+            py_deps = self.metadata["dependencies"].get("Python", ())
+            for dep in itertools.chain(node_deps, (d for d in py_deps if d not in node_deps)):
+                if dep in _DB_DEPS:
+                    parts.append(f"    {backend} --> {dep}[({dep} DB)]\n")
+                elif dep in _CACHE_DEPS:
+                    parts.append(f"    {backend} --> {dep}(({dep} Cache))\n")
 
-        chart += "```\n\n"
+        parts.append("```\n\n")
 
         # 2. Application Flow (Sequence)
-        flow = "```mermaid\nsequenceDiagram\n    participant User\n    participant System\n"
+        parts.append("### Application Flow\n```mermaid\nsequenceDiagram\n    participant User\n    participant System\n")
 
         # Detect DB usage for Sequence Diagram
         has_db = any("Database" in t for t in self.metadata["tech_stack"])
         if not has_db:
             for lang, deps in self.metadata["dependencies"].items():
-                if any(d in ['mongoose', 'mongodb', 'sqlalchemy', 'pymongo', 'mysql',
-                             'mysql2', 'pg', 'psycopg2', 'psycopg2-binary'] for d in deps):
+                if any(d in _DB_CLIENT_DEPS for d in deps):
                     has_db = True
                     break
 
         if has_db:
-            flow += "    participant DB as Database\n"
+            parts.append("    participant DB as Database\n")
 
-        flow += "    User->>System: Request\n"
-        flow += "    System->>System: Process Logic\n"
+        parts.append("    User->>System: Request\n")
+        parts.append("    System->>System: Process Logic\n")
 
         if has_db:
-            flow += "    System->>DB: Query Data\n    DB-->>System: Return Data\n"
+            parts.append("    System->>DB: Query Data\n    DB-->>System: Return Data\n")
 
-        flow += "    System-->>User: Response\n```"
+        parts.append("    System-->>User: Response\n```")
 
-        return "### Component Architecture\n" + chart + "### Application Flow\n" + flow
+        return "".join(parts)
 
     # ---------- README generation ----------
 
     def build_markdown(self, template="Detailed"):
         m = self.metadata
-        langs = sorted(list(m["languages"]))
+        langs = sorted(m["languages"])
+        # section conditions, shared by the TOC and the sections below
+        has_tech = self._has_tech_stack_details()
+        has_docker = m["docker"]["dockerfile"] or m["docker"]["compose"]
+        has_deps = any(m["dependencies"].values())
+        test_files = m["stats"]["test_files"]
+        has_tests = bool(m["tests"]) or test_files > 0
 
-        md = f"# {m['project_name']}\n\n"
+        parts = [f"# {m['project_name']}\n\n"]
 
         if template == "Minimal":
             # language badges
-            for l in langs:
-                md += f"![{l}](https://img.shields.io/badge/Language-{l}-blue) "
-            md += "\n\n"
-            md += f"## 📝 Description\n{m['description']}\n\n"
+            parts.extend(f"![{l}](https://img.shields.io/badge/Language-{l}-blue) " for l in langs)
+            parts.append("\n\n")
+            parts.append(f"## 📝 Description\n{m['description']}\n\n")
             if self.custom_context:
-                md += f"> **Context:** {self.custom_context}\n\n"
-            md += "## 🛠 Tech Stack\n"
-            if self._has_tech_stack_details():
-                md += self._generate_tech_stack_list() + "\n"
+                parts.append(f"> **Context:** {self.custom_context}\n\n")
+            parts.append("## 🛠 Tech Stack\n")
+            if has_tech:
+                parts.append(self._generate_tech_stack_list() + "\n")
             else:
-                md += ", ".join(langs) + "\n\n"
-            md += "## ⚙️ Installation\n" + self._generate_strict_install(langs)
-            md += "## 🚀 Usage\n" + self._generate_strict_usage(langs)
+                parts.append(", ".join(langs) + "\n\n")
+            parts.append("## ⚙️ Installation\n" + self._generate_strict_install(langs))
+            parts.append("## 🚀 Usage\n" + self._generate_strict_usage(langs))
             if m["env_vars"]:
-                md += self._generate_env_section()
+                parts.append(self._generate_env_section())
             if m["api_endpoints"]:
-                md += self._generate_api_section()
-            md += f"## 📄 License\n{m['license']}"
-            return md
+                parts.append(self._generate_api_section())
+            parts.append(f"## 📄 License\n{m['license']}")
+            return "".join(parts)
 
         # Detailed
         if m['username'] != "username":
             user, repo = m['username'], m['repo_name']
-            md += (
+            parts.append(
                 f"[![Stars](https://img.shields.io/github/stars/{user}/{repo}?style=social)]"
                 f"(https://github.com/{user}/{repo}/stargazers) "
             )
-            md += (
+            parts.append(
                 f"[![Forks](https://img.shields.io/github/forks/{user}/{repo}?style=social)]"
                 f"(https://github.com/{user}/{repo}/network/members)\n"
             )
         else:
-            for l in langs:
-                md += f"![{l}](https://img.shields.io/badge/Language-{l}-blue) "
-        md += f"![License](https://img.shields.io/badge/License-{m['license'].replace(' ', '_')}-green)\n\n"
+            parts.extend(f"![{l}](https://img.shields.io/badge/Language-{l}-blue) " for l in langs)
+        parts.append(f"![License](https://img.shields.io/badge/License-{m['license'].replace(' ', '_')}-green)\n\n")
 
-        md += f"## 📝 Description\n{m['description']}\n\n"
+        parts.append(f"## 📝 Description\n{m['description']}\n\n")
         if self.custom_context:
-            md += f"> **Developer Note:** {self.custom_context}\n\n"
+            parts.append(f"> **Developer Note:** {self.custom_context}\n\n")
 
-        md += "## 📸 Screenshot\n![App Screenshot](https://via.placeholder.com/800x400?text=Application+Screenshot)\n\n"
+        parts.append("## 📸 Screenshot\n![App Screenshot](https://via.placeholder.com/800x400?text=Application+Screenshot)\n\n")
 
         # Table of contents
-        md += "## 📑 Table of Contents\n"
-        if self._has_tech_stack_details():
-            md += "- [Tech Stack](#-tech-stack)\n"
-        md += "- [Architecture](#-architecture)\n"
-        md += "- [Project Structure](#-project-structure)\n"
-        md += "- [Installation](#-installation)\n"
-        md += "- [Usage](#-usage)\n"
+        parts.append("## 📑 Table of Contents\n")
+        if has_tech:
+            parts.append("- [Tech Stack](#-tech-stack)\n")
+        parts.append("- [Architecture](#-architecture)\n")
+        parts.append("- [Project Structure](#-project-structure)\n")
+        parts.append("- [Installation](#-installation)\n")
+        parts.append("- [Usage](#-usage)\n")
         if m["api_endpoints"]:
-            md += "- [API Endpoints](#-api-endpoints)\n"
+            parts.append("- [API Endpoints](#-api-endpoints)\n")
         if m["env_vars"]:
-            md += "- [Environment Variables](#-environment-variables)\n"
-        if m["docker"]["dockerfile"] or m["docker"]["compose"]:
-            md += "- [Docker](#-docker)\n"
+            parts.append("- [Environment Variables](#-environment-variables)\n")
+        if has_docker:
+            parts.append("- [Docker](#-docker)\n")
         if m["services"]:
-            md += "- [Services](#-services)\n"
+            parts.append("- [Services](#-services)\n")
         if m["scripts"]:
-            md += "- [Scripts](#-scripts)\n"
-        if any(m["dependencies"].values()):
-            md += "- [Dependencies](#-dependencies)\n"
-        if m["tests"] or m["stats"]["test_files"] > 0:
-            md += "- [Testing](#-testing)\n"
-        md += "- [Project Health](#-project-health)\n"
-        md += "- [Contributing](#-contributing)\n"
-        md += "- [Next Steps](#-next-steps)\n"
-        md += "- [License](#-license)\n\n"
+            parts.append("- [Scripts](#-scripts)\n")
+        if has_deps:
+            parts.append("- [Dependencies](#-dependencies)\n")
+        if has_tests:
+            parts.append("- [Testing](#-testing)\n")
+        parts.append("- [Project Health](#-project-health)\n")
+        parts.append("- [Contributing](#-contributing)\n")
+        parts.append("- [Next Steps](#-next-steps)\n")
+        parts.append("- [License](#-license)\n\n")
 
         # Sections
-        if self._has_tech_stack_details():
-            md += "## 🛠 Tech Stack\n" + self._generate_tech_stack_list() + "\n"
+        if has_tech:
+            parts.append("## 🛠 Tech Stack\n" + self._generate_tech_stack_list() + "\n")
 
-        md += "## 🏗 Architecture\n" + self.generate_diagrams() + "\n\n"
-        md += "## 📂 Project Structure\n" + m["structure"] + "\n\n"
-        md += "## ⚙️ Installation\n" + self._generate_strict_install(langs)
-        md += "## 🚀 Usage\n" + self._generate_strict_usage(langs)
+        parts.append("## 🏗 Architecture\n" + self.generate_diagrams() + "\n\n")
+        parts.append("## 📂 Project Structure\n" + m["structure"] + "\n\n")
+        parts.append("## ⚙️ Installation\n" + self._generate_strict_install(langs))
+        parts.append("## 🚀 Usage\n" + self._generate_strict_usage(langs))
 
         if m["api_endpoints"]:
-            md += self._generate_api_section()
+            parts.append(self._generate_api_section())
         if m["env_vars"]:
-            md += self._generate_env_section()
-        if m["docker"]["dockerfile"] or m["docker"]["compose"]:
-            md += self._generate_docker_section()
+            parts.append(self._generate_env_section())
+        if has_docker:
+            parts.append(self._generate_docker_section())
         if m["services"]:
-            md += self._generate_services_section()
+            parts.append(self._generate_services_section())
 
         # Scripts Section
         if m["scripts"]:
-            md += "## 📜 Scripts\n| Command | Description |\n|---|---|\n"
-            for k, v in m["scripts"].items():
-                md += f"| `npm run {k}` | {v} |\n"
-            md += "\n"
+            parts.append("## 📜 Scripts\n| Command | Description |\n|---|---|\n")
+            parts.extend(f"| `npm run {k}` | {v} |\n" for k, v in m["scripts"].items())
+            parts.append("\n")
 
         # Dependencies Section
-        has_deps = any(m["dependencies"].values())
         if has_deps:
-            md += "## 📦 Dependencies\n"
+            parts.append("## 📦 Dependencies\n")
             for l in langs:
                 if m["dependencies"].get(l):
-                    md += f"**{l}**\n"
-                    for d in sorted(list(m["dependencies"][l]))[:12]:
-                        md += f"- `{d}`\n"
-                    md += "\n"
+                    parts.append(f"**{l}**\n")
+                    parts.extend(f"- `{d}`\n" for d in sorted(m["dependencies"][l])[:12])
+                    parts.append("\n")
 
         # Testing Section
-        if m["tests"] or m["stats"]["test_files"] > 0:
-            md += "## 🧪 Testing\n"
-            if m["tests"]:
-                md += "Detected testing tools/frameworks:\n\n"
-                md += ", ".join(sorted(set(m["tests"]))) + "\n\n"
-            if m["stats"]["test_files"] > 0:
-                md += f"- Approx. **{m['stats']['test_files']}** test files detected\n\n"
-
-            md += "To run the tests, execute (adjust as needed):\n```bash\n"
-            if any(t in m["tests"] for t in ["jest", "mocha"]):
-                md += "npm test\n"
-            elif "pytest" in m["tests"]:
-                md += "pytest\n"
+        if has_tests:
+            parts.append("## 🧪 Testing\n")
+            tests = set(m["tests"])
+            if tests:
+                parts.append("Detected testing tools/frameworks:\n\n")
+                parts.append(", ".join(sorted(tests)) + "\n\n")
+            if test_files > 0:
+                parts.append(f"- Approx. **{test_files}** test files detected\n\n")
+
+            parts.append("To run the tests, execute (adjust as needed):\n```bash\n")
+            if "jest" in tests or "mocha" in tests:
+                parts.append("npm test\n")
+            elif "pytest" in tests:
+                parts.append("pytest\n")
             else:
                 # fallback based on language
                 if "Node.js" in langs:
-                    md += "npm test\n"
+                    parts.append("npm test\n")
                 elif "Python" in langs:
-                    md += "pytest\n"
+                    parts.append("pytest\n")
                 else:
-                    md += "# Run your test command here\n"
-            md += "```\n\n"
+                    parts.append("# Run your test command here\n")
+            parts.append("```\n\n")
 
         # Project Health section
-        md += self._generate_health_section()
+        parts.append(self._generate_health_section())
 
-        md += "## 🤝 Contributing\n1. Fork the Project\n2. Create your Feature Branch\n3. Commit your Changes\n4. Push to the Branch\n5. Open a Pull Request\n\n"
+        parts.append("## 🤝 Contributing\n1. Fork the Project\n2. Create your Feature Branch\n3. Commit your Changes\n4. Push to the Branch\n5. Open a Pull Request\n\n")
 
         # Next steps suggestions
-        md += self._generate_next_steps_section()
+        parts.append(self._generate_next_steps_section())
 
-        md += f"## 📄 License\nThis project is licensed under the **{m['license']}**."
-        return md
+        parts.append(f"## 📄 License\nThis project is licensed under the **{m['license']}**.")
+        return "".join(parts)
 
     # ---------- Helper section generators ----------
 
@@ -882,74 +1635,71 @@ class DeepScanner:
         return "\n".join(lines) + "\n"
 
     def _generate_env_section(self):
-        envs = sorted(list(self.metadata["env_vars"]))
+        envs = sorted(self.metadata["env_vars"])
         if not envs:
             return ""
-        md = "## 🔐 Environment Variables\n\n"
-        md += "Configure the following environment variables (e.g. in a `.env` file):\n\n"
-        md += "```bash\n"
-        for v in envs:
-            md += f"{v}=\n"
-        md += "```\n\n"
-        return md
+        parts = [
+            "## 🔐 Environment Variables\n\n",
+            "Configure the following environment variables (e.g. in a `.env` file):\n\n",
+            "```bash\n",
+        ]
+        parts.extend(f"{v}=\n" for v in envs)
+        parts.append("```\n\n")
+        return "".join(parts)
 
     def _generate_api_section(self):
         eps = self.metadata["api_endpoints"]
         if not eps:
             return ""
-        md = "## 📡 API Endpoints (Auto-detected)\n\n"
-        for ep in eps:
-            md += f"- `{ep}`\n"
-        md += "\n> Note: This list is auto-generated and may be incomplete. Please review and update.\n\n"
-        return md
+        parts = ["## 📡 API Endpoints (Auto-detected)\n\n"]
+        parts.extend(f"- `{ep}`\n" for ep in eps)
+        parts.append("\n> Note: This list is auto-generated and may be incomplete. Please review and update.\n\n")
+        return "".join(parts)
 
     def _generate_docker_section(self):
         d = self.metadata["docker"]
         if not (d["dockerfile"] or d["compose"]):
             return ""
-        md = "## 🐳 Docker\n\n"
+        parts = ["## 🐳 Docker\n\n"]
         if d["dockerfile"]:
-            md += "Build and run using Docker:\n\n```bash\ndocker build -t my-app .\ndocker run -p 8000:8000 my-app\n```\n\n"
+            parts.append("Build and run using Docker:\n\n```bash\ndocker build -t my-app .\ndocker run -p 8000:8000 my-app\n```\n\n")
         if d["compose"]:
-            md += "Or using Docker Compose:\n\n```bash\ndocker-compose up --build\n```\n\n"
-        return md
+            parts.append("Or using Docker Compose:\n\n```bash\ndocker-compose up --build\n```\n\n")
+        return "".join(parts)
 
     def _generate_services_section(self):
         services = self.metadata["services"]
         if not services:
             return ""
-        md = "## 🧩 Services / Packages (Detected)\n\n"
+        parts = ["## 🧩 Services / Packages (Detected)\n\n"]
         for s in sorted(services, key=lambda x: x["name"]):
             langs = ", ".join(s["languages"]) if s["languages"] else "Unknown"
-            md += f"### `{s['name']}/`\n"
-            md += f"- Path: `{s['path']}`\n"
-            md += f"- Languages: {langs}\n\n"
-        return md
+            parts.append(f"### `{s['name']}/`\n- Path: `{s['path']}`\n- Languages: {langs}\n\n")
+        return "".join(parts)
 
     def _generate_health_section(self):
         stats = self.metadata["stats"]
-        md = "## 📊 Project Health Snapshot\n\n"
         files = stats["files"]
-        total_files = sum(files.values())
-        md += f"- **Code Files (approx):** {total_files}\n"
-        for lang, count in files.items():
-            if count:
-                md += f"  - {lang}: {count}\n"
-        md += f"- **Test Files (approx):** {stats['test_files']}\n"
-        md += f"- **CI/CD Config:** {'Yes' if stats['has_ci'] else 'Not detected'}\n"
+        parts = [
+            "## 📊 Project Health Snapshot\n\n",
+            f"- **Code Files (approx):** {sum(files.values())}\n",
+        ]
+        parts.extend(f"  - {lang}: {count}\n" for lang, count in files.items() if count)
+        parts.append(f"- **Test Files (approx):** {stats['test_files']}\n")
+        parts.append(f"- **CI/CD Config:** {'Yes' if stats['has_ci'] else 'Not detected'}\n")
         if stats["linting"]:
-            md += "- **Linting/Formatting:** " + ", ".join(sorted(stats["linting"])) + "\n"
+            parts.append("- **Linting/Formatting:** " + ", ".join(sorted(stats["linting"])) + "\n")
         else:
-            md += "- **Linting/Formatting:** Not detected\n"
-        md += "\n"
-        return md
+            parts.append("- **Linting/Formatting:** Not detected\n")
+        parts.append("\n")
+        return "".join(parts)
 
     def _generate_next_steps_section(self):
         m = self.metadata
         stats = m["stats"]
         suggestions = []
 
-        if m["license"] in ["Unlicensed", "See LICENSE file"]:
+        if m["license"] in ("Unlicensed", "See LICENSE file"):
             suggestions.append("Add a proper LICENSE file (e.g., MIT, Apache 2.0).")
         if stats["test_files"] == 0:
             suggestions.append("Add automated tests (unit/integration) for critical parts.")
@@ -963,107 +1713,158 @@ class DeepScanner:
         if not suggestions:
             suggestions.append("Project looks good! Consider improving documentation and adding more examples.")
 
-        md = "## 🔮 Suggested Next Steps (Auto-generated)\n\n"
-        for s in suggestions:
-            md += f"- [ ] {s}\n"
-        md += "\n"
-        return md
+        parts = ["## 🔮 Suggested Next Steps (Auto-generated)\n\n"]
+        parts.extend(f"- [ ] {s}\n" for s in suggestions)
+        parts.append("\n")
+        return "".join(parts)
 
     # ---------- Installation & Usage ----------
 
     def _generate_strict_install(self, langs):
-        steps = (
-            "1. **Clone the repository**\n"
-            "   ```bash\n"
-            f"   git clone {self.metadata['repo_url']}\n"
-            f"   cd {self.metadata['project_name']}\n"
-            "   ```\n"
+        m = self.metadata
+        req_path = m.get("python_requirements_path")
+        # only needed (and only part of the cache key) without a requirements file
+        py_pkgs = () if req_path else tuple(list(m["dependencies"]["Python"])[:5])
+        return _strict_install(tuple(langs), m['repo_url'], m['project_name'],
+                               req_path, py_pkgs, frozenset(m["build_tools"]))
+
+    def _generate_strict_usage(self, langs):
+        m = self.metadata
+        entry_points = m["entry_points"]
+
+        def entry(lang, default=None):
+            return entry_points.get(lang) or m["entry_point"] or default
+
+        return _strict_usage(
+            tuple(langs), "start" in m["scripts"], frozenset(m["build_tools"]),
+            entry("Node.js", "index.js"), entry("Python", "main.py"),
+            "fastapi" in m["dependencies"]["Python"],
+            m["entry_point_cmd"], entry("Java"), entry("Go", "main.go"),
         )
 
-        # Node.js
-        if "Node.js" in langs:
-            steps += "2. **Node.js Setup**\n   ```bash\n   npm install\n   ```\n"
-
-        # Python
-        if "Python" in langs:
-            steps += "2. **Python Setup**\n   ```bash\n   python -m venv venv\n   source venv/bin/activate\n"
-            req_path = self.metadata.get("python_requirements_path")
-            if req_path:
-                steps += f"   pip install -r {req_path}\n"
-            elif self.metadata["dependencies"]["Python"]:
-                steps += "   pip install " + " ".join(
-                    list(self.metadata["dependencies"]["Python"])[:5]
-                ) + "\n"
-            steps += "   ```\n"
-
-        # Java
-        if "Java" in langs:
-            steps += "2. **Java Setup**\n"
-            if "Maven" in self.metadata["build_tools"]:
-                steps += "   ```bash\n   mvn clean install\n   ```\n"
-            elif "Gradle" in self.metadata["build_tools"]:
-                steps += "   ```bash\n   ./gradlew build\n   ```\n"
-            else:
-                steps += "   ```bash\n   # Raw Java Project: Compile manually\n   javac *.java\n   ```\n"
 
-        # Go
-        if "Go" in langs:
-            steps += "2. **Go Setup**\n   ```bash\n   go mod tidy\n   ```\n"
+# file name -> DeepScanner handler(self, filepath, top_service); one dict
+# lookup per file in _scan_tree instead of a chain of name comparisons
+_FILENAME_HANDLERS = {
+    **dict.fromkeys(CI_CONFIG_FILES, DeepScanner._on_ci_config),
+    **dict.fromkeys(PRETTIER_CONFIG_FILES, DeepScanner._on_js_lint_config),
+    'pylintrc': DeepScanner._on_py_lint_config,
+    '.flake8': DeepScanner._on_py_lint_config,
+    'pyproject.toml': DeepScanner._on_pyproject,
+    'Dockerfile': DeepScanner._on_dockerfile,
+    'docker-compose.yml': DeepScanner._on_compose_file,
+    'docker-compose.yaml': DeepScanner._on_compose_file,
+    'package.json': DeepScanner._on_package_json,
+    'requirements.txt': DeepScanner._on_requirements,
+    'pom.xml': DeepScanner._on_pom,
+    'build.gradle': DeepScanner._on_gradle,
+    'go.mod': DeepScanner._on_go_mod,
+}
 
-        return steps
 
-    def _generate_strict_usage(self, langs):
-        cmd = ""
+# ---------- Installation & Usage (pure, memoized across scans) ----------
+
+@functools.lru_cache(maxsize=128)
+def _strict_install(langs, repo_url, project_name, req_path, py_pkgs, build_tools):
+    parts = [(
+        "1. **Clone the repository**\n"
+        "   ```bash\n"
+        f"   git clone {repo_url}\n"
+        f"   cd {project_name}\n"
+        "   ```\n"
+    )]
+
+    # Node.js
+    if "Node.js" in langs:
+        parts.append("2. **Node.js Setup**\n   ```bash\n   npm install\n   ```\n")
+
+    # Python
+    if "Python" in langs:
+        parts.append("2. **Python Setup**\n   ```bash\n   python -m venv venv\n   source venv/bin/activate\n")
+        if req_path:
+            parts.append(f"   pip install -r {req_path}\n")
+        elif py_pkgs:
+            parts.append("   pip install " + " ".join(py_pkgs) + "\n")
+        parts.append("   ```\n")
+
+    # Java
+    if "Java" in langs:
+        parts.append("2. **Java Setup**\n")
+        if "Maven" in build_tools:
+            parts.append("   ```bash\n   mvn clean install\n   ```\n")
+        elif "Gradle" in build_tools:
+            parts.append("   ```bash\n   ./gradlew build\n   ```\n")
+        else:
+            parts.append("   ```bash\n   # Raw Java Project: Compile manually\n   javac *.java\n   ```\n")
 
-        # Node.js
-        if "Node.js" in langs:
-            cmd += "**Node.js:**\n"
-            if "start" in self.metadata["scripts"]:
-                cmd += "```bash\nnpm start\n```\n"
-            else:
-                entry = self.metadata["entry_points"].get("Node.js") or self.metadata["entry_point"] or "index.js"
-                cmd += f"```bash\nnode {entry}\n```\n"
-
-        # Python
-        if "Python" in langs:
-            cmd += "**Python:**\n"
-            entry = self.metadata["entry_points"].get("Python") or self.metadata["entry_point"] or "main.py"
-            # Detect FastAPI/Flask specifically for run command
-            py_deps = self.metadata["dependencies"]["Python"]
-            if "fastapi" in py_deps:
-                cmd += f"```bash\nuvicorn {entry.replace('.py','')}:app --reload\n```\n"
-            else:
-                cmd += f"```bash\npython {entry}\n```\n"
-
-        # Java
-        if "Java" in langs:
-            cmd += "**Java:**\n"
-            if "Maven" in self.metadata["build_tools"]:
-                cmd += "```bash\nmvn spring-boot:run\n```\n"
-            elif "Gradle" in self.metadata["build_tools"]:
-                cmd += "```bash\n./gradlew bootRun\n```\n"
-            else:
-                entry_cls = self.metadata["entry_point_cmd"]
-                entry_file = self.metadata["entry_points"].get("Java") or self.metadata["entry_point"]
-                if entry_cls and entry_file:
-                    cmd += f"```bash\njavac {entry_file}\njava {entry_cls}\n```\n"
-                else:
-                    cmd += "```bash\njavac Main.java\njava Main\n```\n"
+    # Go
+    if "Go" in langs:
+        parts.append("2. **Go Setup**\n   ```bash\n   go mod tidy\n   ```\n")
 
-        # Go
-        if "Go" in langs:
-            cmd += "**Go:**\n"
-            entry = self.metadata["entry_points"].get("Go") or self.metadata["entry_point"] or "main.go"
-            cmd += f"```bash\ngo run {entry}\n```\n"
+    return "".join(parts)
 
-        return cmd
+
+@functools.lru_cache(maxsize=128)
+def _strict_usage(langs, has_start_script, build_tools, node_entry, py_entry,
+                  uses_fastapi, java_entry_cls, java_entry_file, go_entry):
+    parts = []
+
+    # Node.js
+    if "Node.js" in langs:
+        parts.append("**Node.js:**\n")
+        if has_start_script:
+            parts.append("```bash\nnpm start\n```\n")
+        else:
+            parts.append(f"```bash\nnode {node_entry}\n```\n")
+
+    # Python
+    if "Python" in langs:
+        parts.append("**Python:**\n")
+        # Detect FastAPI/Flask specifically for run command
+        if uses_fastapi:
+            parts.append(f"```bash\nuvicorn {py_entry.replace('.py','')}:app --reload\n```\n")
+        else:
+            parts.append(f"```bash\npython {py_entry}\n```\n")
+
+    # Java
+    if "Java" in langs:
+        parts.append("**Java:**\n")
+        if "Maven" in build_tools:
+            parts.append("```bash\nmvn spring-boot:run\n```\n")
+        elif "Gradle" in build_tools:
+            parts.append("```bash\n./gradlew bootRun\n```\n")
+        elif java_entry_cls and java_entry_file:
+            parts.append(f"```bash\njavac {java_entry_file}\njava {java_entry_cls}\n```\n")
+        else:
+            parts.append("```bash\njavac Main.java\njava Main\n```\n")
+
+    # Go
+    if "Go" in langs:
+        parts.append("**Go:**\n")
+        parts.append(f"```bash\ngo run {go_entry}\n```\n")
+
+    return "".join(parts)
 
 
 def generate_readme(path, template, context):
     scanner = DeepScanner(path, context)
+    key = scanner.cache_key()
+    cached = _cache_get(key) if key else None
+    if cached is None and key:
+        cached = _disk_cache_get(key, scanner.metadata)
+        if cached is not None:
+            _cache_put(key, cached)
+    if cached is not None:
+        scanner.metadata = cached
+        return scanner.build_markdown(template)
+
     try:
         scanner.setup_path()
         scanner.scan()
+        if key:
+            _cache_put(key, scanner.metadata)
+            _disk_cache_put(key, scanner.metadata)
         return scanner.build_markdown(template)
     finally:
-        scanner.cleanup()
+        # the README is ready; let the clone be deleted off the request path
+        scanner.cleanup(background=True)
@@ -0,0 +1,76 @@
+"""
+Unit tests for the Quart routes in app.py
+"""
+import asyncio
+import gzip
+import json
+import types
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, "generate_readme", lambda path, template, context: "# Demo\n" * 500)
+    return app_module.app.test_client()
+
+
+def post_generate(client, headers):
+    async def run():
+        response = await client.post('/generate', json={"path": "/tmp/demo"}, headers=headers)
+        return response, await response.get_data()
+    return asyncio.run(run())
+
+
+def test_generate_response_is_gzipped_when_accepted(client, monkeypatch):
+    """Test Accept-Encoding negotiation on /generate"""
+    monkeypatch.setattr(app_module, "brotli", None)
+    response, body = post_generate(client, {"Accept-Encoding": "gzip, deflate"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(body))["markdown"] == "# Demo\n" * 500
+
+
+def test_generate_response_is_plain_without_accept_encoding(client):
+    """Test that clients which do not ask for compression get plain JSON"""
+    response, body = post_generate(client, {"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(body)["success"] is True
+
+
+def test_generate_response_prefers_brotli_when_installed(client, monkeypatch):
+    """Test that br wins over gzip and is produced at the configured quality"""
+    brotli = pytest.importorskip("brotli")
+    calls = []
+
+    def compress(body, **kwargs):
+        calls.append(kwargs)
+        return brotli.compress(body, **kwargs)
+
+    monkeypatch.setattr(app_module, "brotli", types.SimpleNamespace(compress=compress))
+    response, body = post_generate(client, {"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert calls == [{"quality": app_module.BROTLI_QUALITY}]
+    assert json.loads(brotli.decompress(body))["markdown"] == "# Demo\n" * 500
+
+
+@pytest.mark.parametrize("route", ["/generate", "/save"])
+@pytest.mark.parametrize("body, headers", [
+    ("path=/tmp/demo", {"Content-Type": "application/x-www-form-urlencoded"}),
+    ("not json", {"Content-Type": "application/json"}),
+    ('["/tmp/demo"]', {"Content-Type": "application/json"}),
+])
+def test_non_json_bodies_are_rejected_with_400(client, route, body, headers):
+    """Test that a missing or malformed JSON object is a client error"""
+    async def run():
+        response = await client.post(route, data=body, headers=headers)
+        return response, await response.get_data()
+    response, data = asyncio.run(run())
+
+    assert response.status_code == 400
+    assert json.loads(data)["success"] is False
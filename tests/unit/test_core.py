@@ -0,0 +1,519 @@
+"""
+Unit tests for the DeepScanner engine in core.py
+"""
+import pytest
+import tempfile
+import os
+import time
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import git
+
+import core
+from core import DeepScanner
+
+
+@pytest.fixture(autouse=True)
+def scan_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk scan cache out of the user's home directory"""
+    cache_dir = tmp_path / "scan-cache"
+    monkeypatch.setattr(core, "SCAN_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def sample_project():
+    """Create a small multi-language project on disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "api").mkdir()
+        (root / "api" / "requirements.txt").write_text("flask==2.0\npytest\n")
+        (root / "api" / "app.py").write_text(
+            'import os\n'
+            'from flask import Flask\n'
+            'class User:\n    pass\n'
+            'KEY = os.getenv("SECRET_KEY")\n'
+            '@app.route("/users", methods=["GET", "POST"])\n'
+            'def users(): pass\n'
+            'if __name__ == "__main__":\n    app.run()\n'
+        )
+        (root / "web").mkdir()
+        (root / "web" / "server.js").write_text(
+            "import express from 'express';\n"
+            "const port = process.env.PORT;\n"
+            "app.get('/health', h);\n"
+            "app.listen(port);\n"
+        )
+        (root / "LICENSE").write_text("MIT License\n")
+        yield temp_dir
+
+
+def scan(path):
+    scanner = DeepScanner(path)
+    scanner.setup_path()
+    scanner.scan()
+    return scanner
+
+
+def test_scan_detects_languages_and_entry_points(sample_project):
+    """Test that code analysis results are merged into metadata"""
+    m = scan(sample_project).metadata
+
+    assert m["languages"] == {"Python", "Node.js"}
+    assert m["entry_points"]["Python"] == "app.py"
+    assert m["entry_points"]["Node.js"] == "server.js"
+    assert "User" in m["modules"]
+    assert "flask" in m["dependencies"]["Python"]
+    assert "express" in m["dependencies"]["Node.js"]
+    assert m["env_vars"] == {"SECRET_KEY", "PORT"}
+    assert set(m["api_endpoints"]) == {"GET /users", "POST /users", "GET /health"}
+    assert m["license"] == "MIT"
+
+
+def test_parallel_scan_matches_serial_scan(sample_project, monkeypatch):
+    """Test that the worker pool produces the same README as the serial path"""
+    monkeypatch.setattr(core, "PARALLEL_MIN_FILES", 10 ** 9)
+    serial = scan(sample_project).build_markdown()
+
+    monkeypatch.setattr(core, "PARALLEL_MIN_FILES", 0)
+    parallel = scan(sample_project).build_markdown()
+
+    assert parallel == serial
+
+
+def test_python_single_pass_collects_every_kind_of_hit():
+    """Test that the fused Python pattern finds env vars and routes in one file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        source = (
+            'import os\n'
+            'A = os.environ["ALPHA"]\n'
+            "B = os.environ.get('BETA')\n"
+            'urlpatterns = [path("users/", view)]\n'
+            '@app.post("/items")\n'
+            'def create(): pass\n'
+        )
+        (root / "urls.py").write_text(source)
+        (root / "views.py").write_text(source)
+
+        result = core._analyze_code_worker(str(root / "urls.py"), ".py")
+        assert result["env_vars"] == {"ALPHA", "BETA"}
+        assert result["api_endpoints"] == {"POST /items", "* /users"}
+
+        # Django-style path() calls only count inside urls.py/routes.py
+        result = core._analyze_code_worker(str(root / "views.py"), ".py")
+        assert result["api_endpoints"] == {"POST /items"}
+
+
+@pytest.mark.parametrize("source", [
+    'from dataclasses import dataclass\nif __name__ == "__main__":\n    main()\n',
+    "# the app class\napp.run(debug=True)\n",
+])
+def test_entry_point_after_a_line_ending_in_class_is_found(tmp_path, source):
+    """Test that entry markers are not swallowed by a preceding match"""
+    path = tmp_path / "main.py"
+    path.write_text(source)
+    assert core._analyze_code_worker(str(path), ".py")["is_entry"] is True
+
+
+@pytest.mark.parametrize("ext, source, deps", [
+    (".py", "from dataclasses import dataclass\nfrom requests import get\n", {"dataclasses", "requests"}),
+    (".java", "// helper class\nimport com.google.Foo;\nclass Bar {}\n", {"com.google.Foo"}),
+])
+def test_imports_after_a_line_ending_in_class_are_kept(tmp_path, ext, source, deps):
+    """Test that a class match never runs onto the next line"""
+    path = tmp_path / f"mod{ext}"
+    path.write_text(source)
+    result = core._analyze_code_worker(str(path), ext)
+    assert result["dependencies"] == deps
+    assert result["modules"] == ([] if ext == ".py" else ["Bar"])
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_manifests_are_parsed_for_names_only(monkeypatch, stream):
+    """Test package.json (loaded and streamed) and requirements.txt specifiers"""
+    if stream:
+        if core.ijson is None:
+            pytest.skip("ijson not installed")
+        monkeypatch.setattr(core, "PACKAGE_JSON_STREAM_BYTES", 0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "package.json").write_text(
+            '{"name": "web", "version": "1.0.0", "main": "server.js",'
+            ' "scripts": {"start": "node server.js", "test": "jest"},'
+            ' "dependencies": {"express": "^4.0", "pg": {"version": "8"}},'
+            ' "devDependencies": {"jest": "29"},'
+            ' "config": {"dependencies": {"nested": "1"}}}'
+        )
+        (root / "requirements.txt").write_text(
+            "# web\n-r base.txt\n--index-url https://pypi.org/simple\n"
+            "flask>=2.0\nrequests[socks]~=2.31\npytest==7.0 ; python_version > '3'\n"
+            "uvicorn\nflask!=2.1\n"
+        )
+
+        m = scan(temp_dir).metadata
+        assert m["project_name"] == "web"
+        assert m["entry_point"] == "server.js"
+        assert m["scripts"] == {"start": "node server.js", "test": "jest"}
+        assert m["dependencies"]["Node.js"] == {"express", "pg"}
+        assert m["dependencies"]["Python"] == {"flask", "requests", "pytest", "uvicorn"}
+        assert "jest" in m["tests"] and "pytest" in m["tests"]
+
+
+@pytest.mark.parametrize("use_pathspec", [True, False])
+def test_marked_and_ignored_paths_are_pruned(monkeypatch, use_pathspec):
+    """Test CACHEDIR.TAG-style markers and .autodocsignore patterns"""
+    if not use_pathspec:
+        monkeypatch.setattr(core, "pathspec", None)
+    elif core.pathspec is None:
+        pytest.skip("pathspec not installed")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for sub in ("src", "cache", "third_party/lib", "src/generated"):
+            (root / sub).mkdir(parents=True)
+        (root / "src" / "app.py").write_text("import flask\n")
+        (root / "src" / "schema_gen.py").write_text("import protobuf\n")
+        (root / "src" / "generated" / "models.py").write_text("import sqlalchemy\n")
+        (root / "cache" / "CACHEDIR.TAG").write_text("Signature: 8a477f597d28d172789f06886806bc55\n")
+        (root / "cache" / "blob.py").write_text("import numpy\n")
+        (root / "third_party" / "lib" / "vendored.py").write_text("import six\n")
+        (root / core.IGNORE_FILE).write_text("# local\nthird_party/\ngenerated/\n*_gen.py\n")
+
+        m = scan(temp_dir).metadata
+        assert m["dependencies"]["Python"] == {"flask"}
+        assert m["stats"]["files"]["Python"] == 1
+        assert {s["name"] for s in m["services"]} == {"src"}
+        assert "cache/" not in m["structure"]
+
+
+@pytest.mark.parametrize("use_pathspec", [True, False])
+def test_ignore_globs_follow_gitignore_rules(tmp_path, monkeypatch, use_pathspec):
+    """Test that '*' stops at '/' and '**/' also matches at the top level"""
+    if not use_pathspec:
+        monkeypatch.setattr(core, "pathspec", None)
+    elif core.pathspec is None:
+        pytest.skip("pathspec not installed")
+    (tmp_path / core.IGNORE_FILE).write_text("src/*.py\n**/fixtures\ndocs/**/\n[!m]*.js\n")
+    ignore = core._load_ignore(str(tmp_path))
+
+    assert ignore("src/app.py", False)
+    assert not ignore("src/pkg/app.py", False)
+    assert ignore("fixtures", True) and ignore("tests/fixtures", True)
+    assert ignore("docs", True) and not ignore("src/docs", True)
+    assert not ignore("docs", False)
+    assert ignore("app.js", False) and not ignore("main.js", False)
+
+
+def test_subtree_byte_budget_limits_analysis(monkeypatch):
+    """Test that one large top-level directory cannot exhaust the scan budget"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "third_party").mkdir()
+        (root / "app").mkdir()
+        for i in range(5):
+            (root / "third_party" / f"mod{i}.py").write_text(f"import dep{i}\n" + "#" * 100)
+        (root / "app" / "main.py").write_text("import flask\n")
+        monkeypatch.setattr(core, "MAX_SUBTREE_BYTES", 250)
+
+        m = scan(temp_dir).metadata
+        assert m["stats"]["files"]["Python"] == 6
+        assert "flask" in m["dependencies"]["Python"]
+        assert len(m["dependencies"]["Python"] - {"flask"}) == 2
+
+
+def test_modules_are_deduplicated_in_discovery_order():
+    """Test that repeated class names (e.g. Django Meta) are listed once"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "a_models.py").write_text("class User:\n    class Meta:\n        pass\n")
+        (root / "b_models.py").write_text("class Order:\n    class Meta:\n        pass\n")
+
+        modules = scan(temp_dir).metadata["modules"]
+        assert sorted(modules) == ["Meta", "Order", "User"]
+        assert len(modules) == len(set(modules))
+
+
+@pytest.mark.parametrize("url", [
+    "git@github.com:octo/my.github.io.git",
+    "https://github.com/octo/my.github.io/",
+    "ssh://git@github.com/octo/my.github.io.git",
+])
+def test_origin_url_is_parsed_into_owner_and_repo(url):
+    """Test HTTPS, scp-style and ssh:// remotes, including dots in the repo name"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        git.Repo.init(temp_dir).create_remote("origin", url)
+        scanner = DeepScanner(temp_dir)
+        scanner.setup_path()
+        assert scanner.metadata["username"] == "octo"
+        assert scanner.metadata["repo_name"] == "my.github.io"
+
+
+def test_install_and_usage_text_is_memoized():
+    """Test the pure install/usage builders and their cache"""
+    core._strict_install.cache_clear()
+    args = (("Java", "Python"), "<repo_url>", "demo", None, ("flask",), frozenset({"Gradle"}))
+    text = core._strict_install(*args)
+    assert "pip install flask\n" in text
+    assert "./gradlew build" in text
+    assert core._strict_install(*args) is text
+    assert core._strict_install.cache_info().hits == 1
+
+    usage = core._strict_usage(("Go", "Python"), False, frozenset(), "index.js",
+                               "main.py", True, None, None, "cmd.go")
+    assert "uvicorn main:app --reload" in usage
+    assert "go run cmd.go" in usage
+
+
+@pytest.mark.parametrize("filename, text, expected", [
+    ("LICENSE", "MIT License\n\nCopyright (c) 2024\n", "MIT"),
+    ("LICENSE.txt", "                                 Apache License\n", "Apache 2.0"),
+    ("COPYING", "Everyone is permitted to copy... GNU GENERAL PUBLIC LICENSE\n", "GPL"),
+    ("license.md", "BSD 3-Clause License\n", "BSD"),
+    ("LICENSE", "Permission is hereby granted, free of charge\n", "See LICENSE file"),
+])
+def test_license_family_is_read_from_file_head(filename, text, expected):
+    """Test whole-word license detection ('permitted' is not MIT)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        (Path(temp_dir) / filename).write_text(text)
+        assert scan(temp_dir).metadata["license"] == expected
+
+
+def test_test_dirs_are_judged_relative_to_the_scan_root():
+    """Test that a project checked out under a 'tests' folder is not all tests"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project = Path(temp_dir) / "tests" / "proj"
+        (project / "tests").mkdir(parents=True)
+        (project / "app.py").write_text("import flask\n")
+        (project / "tests" / "helpers.py").write_text("import pytest\n")
+
+        assert scan(str(project)).metadata["stats"]["test_files"] == 1
+
+
+def test_js_single_pass_handles_require_and_scoped_packages():
+    """Test require()/import forms, scoped package names and entry markers"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        src = Path(temp_dir) / "index.js"
+        src.write_text(
+            "const _ = require('lodash/fp');\n"
+            "const db = require( \"@prisma/client\" );\n"
+            "import 'dotenv/config';\n"
+            "const { join } = require('path');\n"
+            "const local = require('./util');\n"
+            "server.listen(process.env.PORT);\n"
+        )
+
+        result = core._analyze_code_worker(str(src), ".js")
+        assert result["dependencies"] == {"lodash", "@prisma/client", "dotenv"}
+        assert result["env_vars"] == {"PORT"}
+        assert result["is_entry"] is True
+
+
+def test_reused_read_buffer_does_not_leak_between_files():
+    """Test that a short file is not scanned past its own length"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        long_file = Path(temp_dir) / "long.py"
+        short_file = Path(temp_dir) / "short.py"
+        long_file.write_text("import os\n" + "#\n" * 500 + "class Leaked:\n    pass\n")
+        short_file.write_text("import json\n")
+        assert long_file.stat().st_size < core.MMAP_MIN_BYTES
+
+        assert core._analyze_code_worker(str(long_file), ".py")["modules"] == ["Leaked"]
+        assert core._analyze_code_worker(str(short_file), ".py")["modules"] == []
+
+
+def test_large_files_are_mapped_and_oversized_files_skipped(monkeypatch):
+    """Test the mmap read path and the MAX_ANALYZE_BYTES guard"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        big = Path(temp_dir) / "big.py"
+        padding = "# padding\n" * (core.MMAP_MIN_BYTES // 10 + 1)
+        big.write_text(padding + "import requests\nclass Service:\n    pass\n")
+
+        result = core._analyze_code_worker(str(big), ".py")
+        assert result["dependencies"] == {"requests"}
+        assert result["modules"] == ["Service"]
+
+        monkeypatch.setattr(core, "MAX_ANALYZE_BYTES", core.MMAP_MIN_BYTES)
+        result = core._analyze_code_worker(str(big), ".py")
+        assert result["language"] == "Python"
+        assert result["dependencies"] == set()
+
+
+def test_minified_and_oversized_files_are_not_analyzed(monkeypatch):
+    """Test that excluded and too-large sources are counted but never opened"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "bundle.min.js").write_text("import leftpad from 'leftpad';\n")
+        (root / "bundle.3f2a9c.js").write_text("import react from 'react';\n")
+        (root / "huge.js").write_text("import lodash from 'lodash';\n" + "//\n" * 100)
+        (root / "index.js").write_text("import express from 'express';\n")
+        monkeypatch.setattr(core, "MAX_ANALYZE_BYTES", 100)
+
+        m = scan(temp_dir).metadata
+        assert m["dependencies"]["Node.js"] == {"express"}
+        assert m["stats"]["files"]["Node.js"] == 4
+
+
+def test_generate_readme_reuses_cached_scan_until_tree_changes(sample_project, monkeypatch):
+    """Test that an unchanged tree is not rescanned and a modified one is"""
+    calls = []
+    original_scan = DeepScanner.scan
+
+    def counting_scan(self):
+        calls.append(self.path)
+        return original_scan(self)
+
+    monkeypatch.setattr(DeepScanner, "scan", counting_scan)
+
+    detailed = core.generate_readme(sample_project, "Detailed", "")
+    minimal = core.generate_readme(sample_project, "Minimal", "")
+    assert len(calls) == 1
+    assert detailed != minimal
+
+    new_file = Path(sample_project) / "worker.go"
+    new_file.write_text("package main\nfunc main() {}\n")
+    future = time.time_ns() + 10 ** 9
+    os.utime(new_file, ns=(future, future))
+    assert "Go" in core.generate_readme(sample_project, "Minimal", "")
+    assert len(calls) == 2
+
+
+def test_disk_cache_survives_a_cleared_memory_cache(sample_project, scan_cache_dir, monkeypatch):
+    """Test that a fresh process reuses the on-disk scan with sets restored"""
+    first = core.generate_readme(sample_project, "Detailed", "")
+    assert len(list(scan_cache_dir.glob("*.json"))) == 1
+
+    core._SCAN_CACHE.clear()
+    monkeypatch.setattr(DeepScanner, "scan", lambda self: pytest.fail("rescanned"))
+    assert core.generate_readme(sample_project, "Detailed", "") == first
+    cached = core._cache_get(DeepScanner(sample_project).cache_key())
+    assert cached["dependencies"]["Python"] == {"flask", "pytest"}
+
+    core._SCAN_CACHE.clear()
+    monkeypatch.setattr(core, "SCAN_CACHE_TTL", -1)
+    with pytest.raises(pytest.fail.Exception):
+        core.generate_readme(sample_project, "Detailed", "")
+
+
+def test_remote_clone_fetches_only_the_tip_without_tags(tmp_path):
+    """Test that scans of a remote URL get a shallow, tag-free checkout"""
+    src = git.Repo.init(tmp_path / "src")
+    for i in range(2):
+        (tmp_path / "src" / "app.py").write_text(f"VERSION = {i}\n")
+        src.index.add(["app.py"])
+        src.index.commit(f"commit {i}")
+    src.create_tag("v1")
+    src.clone(str(tmp_path / "origin.git"), bare=True)
+
+    scanner = DeepScanner((tmp_path / "origin.git").as_uri())
+    try:
+        clone = git.Repo(scanner.setup_path())
+        assert clone.tags == []
+        assert len(list(clone.iter_commits())) == 1
+    finally:
+        scanner.cleanup()
+
+
+@pytest.mark.parametrize("stderr, calls", [
+    ("fatal: the remote end hung up; server does not support filter", 2),
+    ("fatal: repository 'https://example.com/x.git/' not found", 1),
+])
+def test_remote_clone_retries_without_filter_only_when_it_was_rejected(monkeypatch, stderr, calls):
+    """Test that only a rejected --filter falls back to a plain shallow clone"""
+    seen = []
+
+    def clone_from(url, to_path, **kwargs):
+        seen.append(kwargs["multi_options"])
+        raise git.GitCommandError("clone", 128, stderr=stderr)
+
+    monkeypatch.setattr(git.Repo, "clone_from", clone_from)
+    scanner = DeepScanner("https://example.com/x.git")
+    with pytest.raises(Exception, match="Clone failed"):
+        scanner.setup_path()
+    assert len(seen) == calls
+    assert "--filter=blob:none" in seen[0]
+    assert all("--filter=blob:none" not in opts for opts in seen[1:])
+
+
+def test_config_files_are_recognised_by_name(tmp_path):
+    """Test the file-name dispatch for CI, lint, Docker and build configs"""
+    for name in (".travis.yml", ".flake8", ".eslintrc.js", "build.gradle", "docker-compose.yaml"):
+        (tmp_path / name).write_text("")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "pyproject.toml").write_text("")
+
+    m = scan(str(tmp_path)).metadata
+    assert m["stats"]["has_ci"] is True
+    assert m["stats"]["linting"] == {"Python", "JavaScript/TypeScript", "Python (pyproject)"}
+    assert m["docker"] == {"dockerfile": False, "compose": True}
+    assert m["build_tools"] == {"Gradle"}
+    assert "Java" in m["languages"]
+
+
+def test_license_directory_is_not_read_as_a_license(tmp_path):
+    """Test that only regular files are considered by the license scan"""
+    (tmp_path / "licenses").mkdir()
+    (tmp_path / "LICENSE.md").write_text("Apache License 2.0\n")
+
+    scanner = DeepScanner(str(tmp_path))
+    scanner.setup_path()
+    scanner._scan_license()
+    assert scanner.metadata["license"] == "Apache 2.0"
+
+
+def test_prefetch_stops_once_the_worker_pool_takes_over(monkeypatch):
+    """Test that big repos drop their queued reads before the pool runs"""
+    handed_over = []
+    original_analyze = DeepScanner._analyze_files
+
+    def spy(self, code_files, prefetched):
+        handed_over.append(prefetched)
+        return original_analyze(self, code_files, prefetched)
+
+    monkeypatch.setattr(DeepScanner, "_analyze_files", spy)
+    monkeypatch.setattr(core, "PARALLEL_MIN_FILES", 3)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for i in range(10):
+            (Path(temp_dir) / f"mod{i}.py").write_text(f"class Mod{i}:\n    pass\n")
+        m = scan(temp_dir).metadata
+    assert handed_over == [None]
+    assert sorted(m["modules"]) == [f"Mod{i}" for i in range(10)]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows analyzes in threads")
+def test_parallel_scans_share_one_non_fork_worker_pool(sample_project, monkeypatch):
+    """Test that big scans reuse a single forkserver/spawn process pool"""
+    monkeypatch.setattr(core, "PARALLEL_MIN_FILES", 0)
+    first = scan(sample_project).metadata
+    pool = core._ANALYSIS_POOL
+    second = scan(sample_project).metadata
+
+    assert pool is not None and core._ANALYSIS_POOL is pool
+    assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    assert first["modules"] == second["modules"] == ["User"]
+
+
+def test_concurrent_scans_share_the_read_pool(sample_project):
+    """Test that scans neither create nor shut down their own reader"""
+    with ThreadPoolExecutor(max_workers=4) as requests:
+        results = list(requests.map(lambda _: scan(sample_project).metadata["modules"], range(8)))
+    assert results == [["User"]] * 8
+    assert core._READ_POOL.submit(len, "ok").result() == 2
+
+
+def test_disk_cache_entries_from_another_layout_are_misses(sample_project, scan_cache_dir):
+    """Test that stale-format entries trigger a rescan instead of a crash"""
+    core.generate_readme(sample_project, "Minimal", "")
+    (entry,) = scan_cache_dir.glob("*.json")
+    assert entry.name.startswith(f"v{core.SCAN_CACHE_VERSION}-")
+
+    stale = json.loads(entry.read_text())
+    del stale["stats"]
+    entry.write_text(json.dumps(stale))
+    core._SCAN_CACHE.clear()
+    key = DeepScanner(sample_project).cache_key()
+    assert core._disk_cache_get(key, DeepScanner(sample_project).metadata) is None
+
+    assert "Python" in core.generate_readme(sample_project, "Detailed", "")
+    assert "stats" in json.loads(entry.read_text())